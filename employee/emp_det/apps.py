@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EmpDetConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'emp_det'
+
+    def ready(self):
+        from . import signals  # noqa: F401
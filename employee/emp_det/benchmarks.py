@@ -0,0 +1,265 @@
+import json
+import logging
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .metrics import QueryCounter
+from .models import Address, Employee, Project
+from .versioning import bump_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = (100, 1000, 10000)
+PROJECTS_PER_EMPLOYEE = 3
+# Relative growth allowed for timings and memory, absolute growth for queries.
+DEFAULT_THRESHOLDS = {'wall_ms': 0.25, 'peak_kb': 0.25, 'queries': 0}
+METRICS = ('wall_ms', 'queries', 'peak_kb')
+
+
+def letters(number, width=4):
+    """``number`` spelled in base 26, since names may only contain letters."""
+    word = ''
+    for _ in range(width):
+        number, digit = divmod(number, 26)
+        word = chr(ord('a') + digit) + word
+    return word
+
+
+def seed_dataset(scale, seed=0):
+    """
+    Insert ``scale`` employees, each with an address and three projects.
+
+    Names, companies and statuses come from a seeded RNG and a fixed start
+    date, so the same scale always produces the same rows.
+    """
+    rng = random.Random(seed)
+    start = timezone.make_aware(timezone.datetime(2024, 1, 1))
+    addresses = Address.objects.bulk_create([
+        Address(add_line=f'{i} Main Road', state='Kerala', hometown='Kochi', pincode='682001')
+        for i in range(scale)
+    ], batch_size=500)
+    employees = Employee.objects.bulk_create([
+        Employee(name=f'Employee {letters(i)}', phone=[f'98{i:08d}'], company=rng.choice(('Acme', 'Globex', 'Initech')),
+                 role=rng.choice(('Dev', 'QA', 'Lead')), active=rng.random() < 0.9, address=address)
+        for i, address in enumerate(addresses)
+    ], batch_size=500)
+    Project.objects.bulk_create([
+        Project(title=f'Project {i:06d}-{n}', description='Benchmark project', start_date=start,
+                end_date=start + timedelta(days=30 + n), employee=employee,
+                status=rng.choice(('Ongoing', 'Done')))
+        for i, employee in enumerate(employees) for n in range(PROJECTS_PER_EMPLOYEE)
+    ], batch_size=500)
+    bump_version(Address)
+    bump_version(Employee)
+    return employees
+
+
+class Scenario:
+    """
+    A named operation; ``run(client, context)`` returns the response of the
+    request it made, or None for operations below the HTTP layer.
+    """
+
+    def __init__(self, name, run):
+        self.name = name
+        self.run = run
+
+
+def employee_payload(name, phone='9876543210'):
+    return {
+        'name': name, 'phone': [phone], 'company': 'Acme', 'role': 'Dev', 'active': True,
+        'is_deleted': False,
+        'address': {'add_line': '1 Main Road', 'state': 'Kerala', 'hometown': 'Kochi', 'pincode': '682001'},
+    }
+
+
+def consume(response):
+    if response is not None and response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def _employee_list(client, context):
+    return client.get('/api/employees/?page_size=50')
+
+
+def _employee_retrieve(client, context):
+    return client.get(f"/api/employees/{context['employee_id']}/")
+
+
+def _project_list(client, context):
+    return client.get('/api/projects/?page_size=50')
+
+
+def _employee_create(client, context):
+    context['created'] = context.get('created', 0) + 1
+    # Phone numbers are unique across employees; seeded ones start with 98.
+    payload = employee_payload(f"Benchmark Hire {letters(context['created'])}", f"97{context['created']:08d}")
+    return client.post('/api/employees/', payload, format='json')
+
+
+def _employee_update(client, context):
+    # The serializer expects every field, so updates send the full record.
+    payload = employee_payload(context['employee_name'])
+    payload['role'] = 'Lead'
+    return client.put(f"/api/employees/{context['employee_id']}/", payload, format='json')
+
+
+def _project_soft_delete_restore(client, context):
+    response = client.delete(f"/api/projects/{context['project_id']}/")
+    Project.objects.all_objects().filter(pk=context['project_id']).restore()
+    return response
+
+
+def _employee_soft_delete_restore(client, context):
+    # DELETE /api/employees/<id>/ removes the address and with it the row,
+    # so the soft-delete path is the bulk endpoint, which cascades to projects.
+    selection = {'ids': [context['employee_id']]}
+    client.post('/api/employees/bulk/delete/', selection, format='json')
+    return client.post('/api/employees/bulk/restore/', selection, format='json')
+
+
+def _report_xlsx(client, context):
+    return consume(client.get('/api/employees/reports/'))
+
+
+SCENARIOS = (
+    Scenario('employee_list', _employee_list),
+    Scenario('employee_retrieve', _employee_retrieve),
+    Scenario('project_list', _project_list),
+    Scenario('employee_create', _employee_create),
+    Scenario('employee_update', _employee_update),
+    Scenario('project_soft_delete_restore', _project_soft_delete_restore),
+    Scenario('employee_soft_delete_restore', _employee_soft_delete_restore),
+    Scenario('report_xlsx', _report_xlsx),
+)
+
+
+def measure(scenario, client, context, repeat):
+    """Median wall time, query count and peak traced memory of one scenario."""
+    # Warm-up run: URL resolution, imports and statement caches.
+    consume(scenario.run(client, context))
+
+    timings = []
+    for _ in range(repeat):
+        # Counted with a wrapper: connection.queries is reset on request_started.
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            response = consume(scenario.run(client, context))
+            timings.append((time.perf_counter() - started) * 1000)
+        if response is not None and response.status_code >= 400:
+            raise RuntimeError(f"{scenario.name} answered {response.status_code}: {getattr(response, 'data', '')}")
+
+    # A separate traced run, since tracemalloc slows everything down.
+    tracemalloc.start()
+    try:
+        consume(scenario.run(client, context))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_ms': round(statistics.median(timings), 3),
+        'wall_ms_min': round(min(timings), 3),
+        'queries': counter.count,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run_suite(scales=DEFAULT_SCALES, repeat=5, scenarios=SCENARIOS, seed=0):
+    """
+    Seed each scale into an emptied database and measure every scenario.
+
+    Meant to run against a throwaway database: all emp_det rows are removed
+    before each scale. The list response cache is disabled so repeated
+    requests measure the query and serialization work, and so is request
+    sampling (instrumentation.py).
+    """
+    results = []
+    client = APIClient()
+    with override_settings(EMP_DET_RESPONSE_CACHE_ENABLED=False, EMP_DET_INSTRUMENTATION_SAMPLE_RATE=0):
+        for scale in scales:
+            Project.objects.all_objects().hard_delete()
+            Employee.objects.all_objects().hard_delete()
+            Address.objects.all().delete()
+            employees = seed_dataset(scale, seed)
+            employee = employees[len(employees) // 2]
+            context = {
+                'employee_id': employee.pk,
+                'employee_name': employee.name,
+                'project_id': employee.projects.values_list('pk', flat=True).first(),
+            }
+            for scenario in scenarios:
+                result = {'scenario': scenario.name, 'scale': scale}
+                result.update(measure(scenario, client, context, repeat))
+                logger.debug("benchmark %s@%s: %s", scenario.name, scale, result)
+                results.append(result)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'repeat': repeat,
+            'seed': seed,
+            'created_at': timezone.now().isoformat(),
+        },
+        'results': results,
+    }
+
+
+def get_thresholds(overrides=None):
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    thresholds.update(getattr(settings, 'EMP_DET_BENCHMARK_THRESHOLDS', {}))
+    thresholds.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    return thresholds
+
+
+def compare(current, baseline, thresholds=None):
+    """
+    Regressions of ``current`` against ``baseline`` as a list of dicts.
+
+    Timings and memory may grow by their relative threshold (0.25 = 25%),
+    query counts by their absolute one. Scenarios missing from the baseline
+    are not compared.
+    """
+    thresholds = get_thresholds(thresholds)
+    previous = {(result['scenario'], result['scale']): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        base = previous.get((result['scenario'], result['scale']))
+        if base is None:
+            continue
+        for metric in METRICS:
+            if metric == 'queries':
+                limit = base[metric] + thresholds[metric]
+            else:
+                limit = base[metric] * (1 + thresholds[metric])
+            if result[metric] > limit:
+                regressions.append({
+                    'scenario': result['scenario'], 'scale': result['scale'], 'metric': metric,
+                    'baseline': base[metric], 'current': result[metric], 'limit': round(limit, 3),
+                })
+    return regressions
+
+
+def write_results(results, path):
+    with open(path, 'w') as handle:
+        json.dump(results, handle, indent=2)
+        handle.write('\n')
+
+
+def load_results(path):
+    with open(path) as handle:
+        return json.load(handle)
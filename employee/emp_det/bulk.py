@@ -0,0 +1,367 @@
+import csv
+import logging
+from datetime import date, datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from openpyxl import load_workbook
+from rest_framework import serializers
+
+from .models import Address, Employee, Project
+from .phones import phone_owners
+from .serializers import (
+    NAME_TAKEN_MESSAGE, PHONE_TAKEN_MESSAGE, TITLE_TAKEN_MESSAGE, EmployeeSerializer, save_unique,
+    validate_title_format,
+)
+from .versioning import bump_version
+
+logger = logging.getLogger(__name__)
+
+# Stays below SQLite's bound-parameter limit for IN (...) lookups.
+LOOKUP_CHUNK_SIZE = 500
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def existing_employee_names(names):
+    """
+    Lower-cased names from ``names`` already taken, soft-deleted rows included.
+    Filtering on Lower('name') lets SQLite use employee_name_ci_unique.
+    """
+    taken = set()
+    for chunk in chunked(list(names), LOOKUP_CHUNK_SIZE):
+        taken.update(
+            Employee.objects.all_objects()
+            .annotate(name_lower=Lower('name'))
+            .filter(name_lower__in=chunk)
+            .values_list('name_lower', flat=True)
+        )
+    return taken
+
+
+def bulk_create_employees(records, batch_size=None):
+    """
+    Validate and insert a list of employee payloads.
+
+    Every record is validated on its own, name and phone uniqueness are
+    checked for the whole batch with set lookups, and the valid records are inserted with
+    bulk_create in one transaction. Returns one result dict per input index.
+    """
+    batch_size = batch_size or getattr(settings, 'EMP_DET_BULK_BATCH_SIZE', 500)
+    results = [None] * len(records)
+    valid = []
+
+    for index, record in enumerate(records):
+        serializer = EmployeeSerializer(data=record, context={'check_phone_owners': False})
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {"index": index, "status": "error", "errors": serializer.errors}
+
+    taken = existing_employee_names({data['name'].lower() for _, data in valid})
+    taken_phones = set(phone_owners({number for _, data in valid for number in data.get('phone', [])}))
+    unique = []
+    for index, data in valid:
+        name_lower = data['name'].lower()
+        if name_lower in taken:
+            results[index] = {
+                "index": index, "status": "error",
+                "errors": {"name": [NAME_TAKEN_MESSAGE]},
+            }
+            continue
+        phones = data.get('phone', [])
+        duplicates = [number for number in phones if number in taken_phones]
+        if duplicates:
+            results[index] = {
+                "index": index, "status": "error",
+                "errors": {"phone": [PHONE_TAKEN_MESSAGE.format(number=number) for number in duplicates]},
+            }
+            continue
+        taken.add(name_lower)
+        taken_phones.update(phones)
+        unique.append((index, data))
+
+    with transaction.atomic():
+        for batch in chunked(unique, batch_size):
+            addresses = Address.objects.bulk_create(
+                [Address(**data['address']) for _, data in batch]
+            )
+            employees = Employee.objects.bulk_create([
+                Employee(address=address, **{key: value for key, value in data.items() if key != 'address'})
+                for address, (_, data) in zip(addresses, batch)
+            ])
+            for employee, (index, _) in zip(employees, batch):
+                results[index] = {"index": index, "status": "created", "id": employee.pk}
+        if unique:
+            bump_version(Address)
+
+    logger.info("bulk employee create: %s created, %s failed", len(unique), len(records) - len(unique))
+    return results
+
+
+PROJECT_STATUSES = {choice for choice, _ in Project.STATUS_CHOICES}
+
+
+def iter_project_rows(path):
+    """
+    Yield ``(line_number, row_dict)`` from a CSV or XLSX file without loading
+    it whole. The first row holds the column names.
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.xlsx':
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.worksheets[0].iter_rows(values_only=True)
+            header = [str(cell).strip().lower() if cell is not None else '' for cell in next(rows, [])]
+            for line, values in enumerate(rows, start=2):
+                if any(value not in (None, '') for value in values):
+                    yield line, dict(zip(header, values))
+        finally:
+            wb.close()
+    elif path.suffix.lower() == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as fh:
+            reader = csv.DictReader(fh)
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+            for row in reader:
+                yield reader.line_num, row
+    else:
+        raise ValueError(f"Unsupported file type: {path.suffix}. Use .csv or .xlsx.")
+
+
+def parse_import_datetime(value):
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime.combine(value, datetime.min.time())
+    else:
+        text = str(value or '').strip()
+        parsed = parse_datetime(text)
+        if parsed is None:
+            parsed_date = parse_date(text)
+            parsed = datetime.combine(parsed_date, datetime.min.time()) if parsed_date else None
+    if parsed is None:
+        raise ValueError("Expected a date or datetime (YYYY-MM-DD[ HH:MM[:SS]]).")
+    if settings.USE_TZ and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def clean_project_row(row):
+    """Field-level checks for one import row; returns (data, errors)."""
+    errors = {}
+    data = {}
+
+    title = str(row.get('title') or '').strip()
+    try:
+        validate_title_format(title)
+        data['title'] = title
+    except serializers.ValidationError as exc:
+        errors['title'] = exc.detail
+
+    data['description'] = str(row.get('description') or '').strip()
+
+    # The serializer's limits; bulk_create would store longer values as is.
+    for field in ('title', 'description'):
+        max_length = Project._meta.get_field(field).max_length
+        if len(data.get(field, '')) > max_length:
+            errors.setdefault(field, []).append(f"Ensure this field has no more than {max_length} characters.")
+
+    for field in ('start_date', 'end_date'):
+        try:
+            data[field] = parse_import_datetime(row.get(field))
+        except ValueError as exc:
+            errors[field] = [str(exc)]
+    if 'start_date' in data and 'end_date' in data:
+        # Checked here because bulk_create skips Project.save().
+        if data['end_date'] < data['start_date']:
+            errors['end_date'] = ["End date must be after the start date."]
+
+    data['status'] = str(row.get('status') or 'Ongoing').strip()
+    if data['status'] not in PROJECT_STATUSES:
+        errors['status'] = [f"Status must be one of: {', '.join(sorted(PROJECT_STATUSES))}."]
+
+    reference = str(row.get('employee') or '').strip()
+    if reference.endswith('.0') and reference[:-2].isdigit():
+        reference = reference[:-2]  # numeric ids read back from spreadsheets
+    if not reference:
+        errors['employee'] = ["An employee id or name is required."]
+    data['employee'] = reference
+
+    return data, errors
+
+
+def resolve_employees(references):
+    """Map employee references (ids or names) to ids with one query."""
+    ids = {int(ref) for ref in references if ref.isdigit()}
+    names = {ref.lower() for ref in references if not ref.isdigit()}
+    resolved = {}
+    if not ids and not names:
+        return resolved
+    rows = (
+        Employee.objects.annotate(name_lower=Lower('name'))
+        .filter(Q(id__in=ids) | Q(name_lower__in=names))
+        .values_list('id', 'name_lower')
+    )
+    for pk, name_lower in rows:
+        resolved[str(pk)] = pk
+        resolved[name_lower] = pk
+    return resolved
+
+
+def existing_project_titles(titles):
+    return set(
+        Project.objects.all_objects()
+        .annotate(title_lower=Lower('title'))
+        .filter(title_lower__in=list(titles))
+        .values_list('title_lower', flat=True)
+    )
+
+
+def import_projects(rows, batch_size=None, dry_run=False, on_error=None):
+    """
+    Validate and insert ``(line_number, row_dict)`` pairs batch by batch.
+
+    Each batch costs one employee lookup, one title lookup and, unless
+    ``dry_run`` is set, one bulk INSERT in its own transaction, so neither
+    memory nor the write lock grows with the file. A dry run inserts nothing,
+    so it remembers the titles of the whole file to catch duplicates across
+    batches. Invalid rows are skipped and passed to
+    ``on_error(line_number, errors)``, as are rows whose title another writer
+    took after the lookup (the batch is then inserted row by row).
+    """
+    batch_size = min(batch_size or getattr(settings, 'EMP_DET_BULK_BATCH_SIZE', 500), LOOKUP_CHUNK_SIZE)
+    summary = {'read': 0, 'created': 0, 'failed': 0}
+    # Titles of earlier batches are in the table unless this is a dry run.
+    file_titles = set()
+
+    def fail(line, errors):
+        summary['failed'] += 1
+        if on_error:
+            on_error(line, errors)
+
+    def insert_project(line, project):
+        project.pk, project._state.adding = None, True  # undo the failed bulk_create
+        try:
+            save_unique('title', TITLE_TAKEN_MESSAGE, lambda: Project.objects.bulk_create([project]))
+        except serializers.ValidationError as exc:
+            fail(line, exc.detail)
+            return False
+        return True
+
+    def flush(batch):
+        cleaned = []
+        for line, row in batch:
+            data, errors = clean_project_row(row)
+            if errors:
+                fail(line, errors)
+            else:
+                cleaned.append((line, data))
+
+        employees = resolve_employees({data['employee'] for _, data in cleaned})
+        taken = existing_project_titles({data['title'].lower() for _, data in cleaned})
+        seen_titles = file_titles if dry_run else set()
+        projects = []
+        for line, data in cleaned:
+            title_lower = data['title'].lower()
+            employee_id = employees.get(data['employee'].lower())
+            if employee_id is None:
+                fail(line, {'employee': [f"Employee {data['employee']!r} not found."]})
+            elif title_lower in taken or title_lower in seen_titles:
+                fail(line, {'title': [TITLE_TAKEN_MESSAGE]})
+            else:
+                seen_titles.add(title_lower)
+                data['employee_id'] = employee_id
+                del data['employee']
+                projects.append((line, Project(**data)))
+
+        if projects and not dry_run:
+            try:
+                with transaction.atomic():
+                    Project.objects.bulk_create([project for _, project in projects])
+            except IntegrityError:
+                # A title taken by another writer since the lookup above:
+                # retry row by row to insert the rest and report the losers.
+                projects = [(line, project) for line, project in projects if insert_project(line, project)]
+        summary['created'] += len(projects)
+
+    batch = []
+    for line, row in rows:
+        summary['read'] += 1
+        batch.append((line, row))
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    logger.info("project import%s: %s", " (dry run)" if dry_run else "", summary)
+    return summary
+
+
+def close_expired_projects(now=None, batch_size=LOOKUP_CHUNK_SIZE, dry_run=False):
+    """
+    Mark every Ongoing project whose end_date has passed as Done, soft-deleted
+    ones included, and return how many changed.
+
+    Each batch is one ``UPDATE ... WHERE id IN (SELECT id ... LIMIT n)`` in its
+    own transaction, so no rows are loaded and the write lock is held briefly.
+    The queryset update bumps the row versions and the Project data version.
+    """
+    now = now or timezone.now()
+    expired = Project.objects.all_objects().filter(status='Ongoing', end_date__lt=now)
+    if dry_run:
+        return expired.count()
+
+    closed = 0
+    while True:
+        with transaction.atomic():
+            batch = expired.order_by('pk').values('pk')[:batch_size]
+            updated = Project.objects.all_objects().filter(pk__in=batch).update(status='Done')
+        closed += updated
+        if updated < batch_size:
+            return closed
+
+
+def soft_delete_employees(employees):
+    """
+    Soft-delete the selected employees and their live projects; two UPDATEs in
+    one transaction. The projects get the employees' deleted_at, which is how
+    restore_employees() tells them from projects deleted on their own.
+    """
+    deleted_at = timezone.now()
+    with transaction.atomic():
+        selected = employees.alive().values('pk')
+        projects = Project.objects.all_objects().filter(employee__in=selected).delete(deleted_at)
+        employees = employees.delete(deleted_at)
+    return {'employees': employees, 'projects': projects}
+
+
+def restore_employees(employees):
+    """Undo soft_delete_employees(): restore the employees and the projects deleted with them."""
+    with transaction.atomic():
+        deleted = employees.dead()
+        # Matched before the employees' deleted_at is cleared.
+        projects = Project.objects.all_objects().filter(
+            employee__in=deleted.values('pk'),
+            deleted_at=Subquery(Employee.objects.all_objects().filter(pk=OuterRef('employee_id')).values('deleted_at')),
+        ).restore()
+        employees = deleted.restore()
+    return {'employees': employees, 'projects': projects}
+
+
+def soft_delete_projects(projects):
+    with transaction.atomic():
+        return {'projects': projects.delete()}
+
+
+def restore_projects(projects):
+    with transaction.atomic():
+        return {'projects': projects.restore()}
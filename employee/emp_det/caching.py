@@ -0,0 +1,125 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .metrics import cache_requests
+from .versioning import adata_version_stamp, data_version_stamp
+
+# Headers worth replaying from a cached list response.
+CACHED_HEADERS = ('X-Total-Count',)
+
+
+class ResponseCacheStats:
+    """Per-process counters for the list response cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def record(self, hit=False, stored=False):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if stored:
+                self.stores += 1
+
+    def observe_generation(self, name, generation):
+        # A new generation means every entry cached under the old one is stale.
+        with self._lock:
+            previous = self._generations.get(name)
+            if previous is not None and previous != generation:
+                self.invalidations += 1
+            self._generations[name] = generation
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def get_response_cache():
+    return caches[getattr(settings, 'EMP_DET_RESPONSE_CACHE_ALIAS', 'default')]
+
+
+class CachedListMixin:
+    """
+    Cache GET list responses under a key made of the view name, the
+    generation counters of ``cache_models`` and the full request path.
+
+    Writes bump the counters (signals and SoftDeleteQuerySet), so stale
+    entries are never read again and simply age out of the cache.
+    """
+    cache_models = ()
+
+    def list_cache_key(self, request, generation=None):
+        if generation is None:
+            generation = data_version_stamp(self.cache_models)
+        response_cache_stats.observe_generation(type(self).__name__, generation)
+        path = hashlib.sha1(request.get_full_path().encode('utf-8')).hexdigest()
+        return f"emp_det:list:{type(self).__name__}:{generation}:{path}"
+
+    def cached_list(self, request, *args, **kwargs):
+        if not getattr(settings, 'EMP_DET_RESPONSE_CACHE_ENABLED', True):
+            return self.list(request, *args, **kwargs)
+
+        cache = get_response_cache()
+        key = self.list_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            return self.cache_hit(cached)
+
+        response = self.list(request, *args, **kwargs)
+        entry = self.cache_entry(response)
+        if entry is not None:
+            cache.set(key, entry, getattr(settings, 'EMP_DET_RESPONSE_CACHE_TIMEOUT', 300))
+        return response
+
+    async def acached_list(self, request, *args, **kwargs):
+        """cached_list() for async views; the page comes from ``alist``."""
+        if not getattr(settings, 'EMP_DET_RESPONSE_CACHE_ENABLED', True):
+            return await self.alist(request, *args, **kwargs)
+
+        cache = get_response_cache()
+        key = self.list_cache_key(request, await adata_version_stamp(self.cache_models))
+        cached = await cache.aget(key)
+        if cached is not None:
+            return self.cache_hit(cached)
+
+        response = await self.alist(request, *args, **kwargs)
+        entry = self.cache_entry(response)
+        if entry is not None:
+            await cache.aset(key, entry, getattr(settings, 'EMP_DET_RESPONSE_CACHE_TIMEOUT', 300))
+        return response
+
+    def cache_hit(self, cached):
+        response_cache_stats.record(hit=True)
+        cache_requests.inc(cache='response', result='hit')
+        return Response(cached['data'], status=cached['status'], headers=cached['headers'])
+
+    def cache_entry(self, response):
+        """What to store for a freshly built response, or None."""
+        stored = response.status_code in (200, 404)
+        response_cache_stats.record(stored=stored)
+        cache_requests.inc(cache='response', result='miss')
+        if not stored:
+            return None
+        headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+        return {'data': response.data, 'status': response.status_code, 'headers': headers}
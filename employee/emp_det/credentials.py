@@ -0,0 +1,181 @@
+import base64
+import binascii
+import copy
+import hashlib
+import hmac
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.cache import caches
+
+from .metrics import cache_requests
+
+logger = logging.getLogger(__name__)
+
+# Attribute on the Django HttpRequest that carries the verified user from
+# AuthenticationMiddleware to CustomAuthentication.
+REQUEST_USER_ATTR = '_emp_det_basic_user'
+
+
+class CredentialCache:
+    """
+    Bounded LRU of verified Basic credentials with a per-entry TTL.
+
+    Keys are HMAC digests of ``username:password`` so no plaintext password is
+    held in memory. Each entry holds a snapshot of the user, handed out as a
+    copy so requests cannot see each other's changes, and the user's stamp
+    from the EMP_DET_CREDENTIAL_STAMP_CACHE Django cache. Saving or deleting
+    the user (see signals.py) replaces the stamp, which invalidates the entry
+    in every worker sharing that cache; with a per-process cache backend
+    other workers only drop it after the TTL.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(username, password):
+        secret = settings.SECRET_KEY.encode('utf-8')
+        return hmac.new(secret, f"{username}:{password}".encode('utf-8'), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def stamp_cache():
+        return caches[getattr(settings, 'EMP_DET_CREDENTIAL_STAMP_CACHE', 'default')]
+
+    @staticmethod
+    def stamp_key(user_id):
+        return f"emp_det:credential-stamp:{user_id}"
+
+    def user_stamp(self, user_id):
+        # A missing stamp (never set, or evicted) is replaced by a fresh one,
+        # so entries made under an earlier stamp cannot match again.
+        cache, key = self.stamp_cache(), self.stamp_key(user_id)
+        stamp = cache.get(key)
+        if stamp is None:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            stamp = cache.get(key)
+        return stamp
+
+    def get(self, username, password):
+        key = self.digest(username, password)
+        with self._lock:
+            entry = self._entries.get(key)
+        # The stamp lookup may be a network round trip, so it runs unlocked.
+        if entry is None or entry[1] < time.monotonic() or entry[2] != self.user_stamp(entry[0].pk):
+            with self._lock:
+                if entry is not None and self._entries.get(key) is entry:
+                    self._discard(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.copy(entry[0])
+
+    def set(self, username, password, user):
+        key = self.digest(username, password)
+        entry = (copy.copy(user), time.monotonic() + self.ttl, self.user_stamp(user.pk))
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = entry
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id):
+        self.stamp_cache().set(self.stamp_key(user_id), uuid.uuid4().hex, timeout=None)
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, ()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get(entry[0].pk)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[entry[0].pk]
+
+
+credential_cache = CredentialCache(
+    maxsize=getattr(settings, 'EMP_DET_CREDENTIAL_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'EMP_DET_CREDENTIAL_CACHE_TTL', 300),
+)
+
+
+def decode_basic_header(request):
+    """Return ``(username, password)`` from a Basic Authorization header, or None."""
+    code = request.headers.get('Authorization')
+    if not code:
+        return None
+    try:
+        scheme, encoded = code.split(' ', 1)
+        if scheme.lower() != 'basic':
+            return None
+        username, password = base64.b64decode(encoded).decode('utf-8').split(':', 1)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    return username, password
+
+
+def verify_credentials(request, username, password):
+    """
+    Return the active user for ``username``/``password`` or None.
+
+    The result is remembered on the request, so the middleware and the DRF
+    authentication class verify at most once per request, and in the
+    credential cache, so repeat clients skip the user query and the hasher.
+    """
+    django_request = getattr(request, '_request', request)
+    verified = getattr(django_request, REQUEST_USER_ATTR, None)
+    if verified is not None and verified.get_username() == username:
+        return verified
+
+    user = credential_cache.get(username, password)
+    cache_requests.inc(cache='credential', result='miss' if user is None else 'hit')
+    if user is None:
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            logger.info("user does not exist (credential check)")
+            return None
+        if not user.is_active or not check_password(password, user.password):
+            logger.info("password did not match (credential check)")
+            return None
+        credential_cache.set(username, password, user)
+
+    setattr(django_request, REQUEST_USER_ATTR, user)
+    return user
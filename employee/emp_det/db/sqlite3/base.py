@@ -0,0 +1,29 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend with a configurable ``BEGIN`` mode for atomic blocks.
+
+    ``OPTIONS['transaction_mode'] = 'IMMEDIATE'`` takes the write lock when
+    the transaction starts, so a transaction that reads and then writes
+    waits on busy_timeout instead of failing with "database is locked" when
+    it tries to upgrade its lock. Django 5.1 supports the same option natively.
+    """
+    transaction_modes = frozenset(('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE'))
+    transaction_mode = None
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        mode = kwargs.pop('transaction_mode', None)
+        if mode is not None and mode.upper() not in self.transaction_modes:
+            raise ImproperlyConfigured(f"transaction_mode must be one of {', '.join(sorted(self.transaction_modes))}")
+        self.transaction_mode = mode.upper() if mode else None
+        return kwargs
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f"BEGIN {self.transaction_mode}")
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,162 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import FilteredRelation, Q
+
+from .models import Employee, Project
+
+DEFAULT_CHUNK_SIZE = 2000
+BOOLEAN_VALUES = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+
+class ExportError(ValueError):
+    pass
+
+
+class ExportSpec:
+    """
+    Column and filter whitelist for one flat export.
+
+    ``columns`` maps output column names to ORM paths, ``filters`` maps query
+    parameters to lookups. ``join_columns`` need the live-projects join, which
+    is only added when one of them is selected.
+    """
+
+    def __init__(self, model, columns, filters, join_columns=(), list_columns=(), boolean_filters=()):
+        self.model = model
+        self.columns = columns
+        self.filters = filters
+        self.boolean_filters = set(boolean_filters)
+        self.join_columns = set(join_columns)
+        self.list_columns = set(list_columns)
+
+    def select_columns(self, value):
+        if not value:
+            return list(self.columns)
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise ExportError(f"Unknown columns: {', '.join(unknown)}. Allowed: {', '.join(self.columns)}.")
+        return names
+
+    def base_queryset(self, deleted):
+        manager = self.model.objects
+        if deleted == 'exclude':
+            return manager.get_queryset()
+        if deleted == 'only':
+            return manager.deleted_objects()
+        if deleted == 'include':
+            return manager.all_objects()
+        raise ExportError("deleted must be one of: exclude, only, include.")
+
+    def queryset(self, params):
+        columns = self.select_columns(params.get('columns'))
+        queryset = self.base_queryset(params.get('deleted', 'exclude'))
+
+        for param, lookup in self.filters.items():
+            if param not in params:
+                continue
+            value = params[param]
+            if param in self.boolean_filters:
+                if value.lower() not in BOOLEAN_VALUES:
+                    raise ExportError(f"{param} must be true or false.")
+                value = BOOLEAN_VALUES[value.lower()]
+            queryset = queryset.filter(**{lookup: value})
+
+        if self.join_columns.intersection(columns):
+            queryset = queryset.annotate(
+                live_projects=FilteredRelation('projects', condition=Q(projects__is_deleted=False))
+            ).order_by('id', 'live_projects__id')
+        else:
+            queryset = queryset.order_by('id')
+
+        return columns, queryset.values_list(*[self.columns[name] for name in columns])
+
+
+EMPLOYEE_EXPORT = ExportSpec(
+    Employee,
+    columns={
+        'id': 'id',
+        'name': 'name',
+        'role': 'role',
+        'company': 'company',
+        'phone': 'phone',
+        'active': 'active',
+        'address_line': 'address__add_line',
+        'address_state': 'address__state',
+        'address_hometown': 'address__hometown',
+        'address_pincode': 'address__pincode',
+        'project_id': 'live_projects__id',
+        'project_title': 'live_projects__title',
+        'project_status': 'live_projects__status',
+        'project_start_date': 'live_projects__start_date',
+        'project_end_date': 'live_projects__end_date',
+    },
+    filters={
+        'active': 'active',
+        'company': 'company__iexact',
+        'role': 'role__iexact',
+        'state': 'address__state__iexact',
+        'pincode': 'address__pincode',
+    },
+    join_columns=['project_id', 'project_title', 'project_status', 'project_start_date', 'project_end_date'],
+    list_columns=['phone'],
+    boolean_filters=['active'],
+)
+
+PROJECT_EXPORT = ExportSpec(
+    Project,
+    columns={
+        'id': 'id',
+        'title': 'title',
+        'description': 'description',
+        'start_date': 'start_date',
+        'end_date': 'end_date',
+        'duration': 'duration',
+        'status': 'status',
+        'employee_id': 'employee_id',
+        'employee_name': 'employee__name',
+    },
+    filters={
+        'status': 'status',
+        'employee': 'employee_id',
+    },
+)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def stream_csv(spec, columns, rows):
+    writer = csv.writer(_Echo())
+    list_indexes = [i for i, name in enumerate(columns) if name in spec.list_columns]
+    yield writer.writerow(columns)
+    for row in rows:
+        if list_indexes:
+            row = list(row)
+            for i in list_indexes:
+                row[i] = ", ".join(row[i]) if isinstance(row[i], list) else ""
+        yield writer.writerow(row)
+
+
+def stream_ndjson(spec, columns, rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
+
+
+def export_stream(spec, export_format, params, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return ``(generator, content_type)`` for a validated export request."""
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError(f"Unsupported format: {export_format}. Use csv or ndjson.")
+    writer, content_type = EXPORT_FORMATS[export_format]
+    columns, queryset = spec.queryset(params)
+    return writer(spec, columns, queryset.iterator(chunk_size=chunk_size)), content_type
@@ -0,0 +1,77 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetSerializerMixin:
+    """Serializer that keeps only the field names passed as ``fields``."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    ``?fields=a,b`` / ``?exclude=c`` for GET requests.
+
+    The queryset is narrowed with ``.only()``. A field named after a model
+    field loads that column; ``fieldset_columns`` overrides this (e.g. for
+    columns read through a join), and computed fields load nothing.
+    """
+    fieldset_columns = {}
+
+    def get_fieldset(self):
+        """Selected serializer field names in declaration order, or None for all."""
+        if hasattr(self, '_fieldset'):
+            return self._fieldset
+
+        self._fieldset = None
+        params = self.request.query_params
+        if self.request.method == 'GET' and ('fields' in params or 'exclude' in params):
+            available = list(self.get_serializer_class()().fields)
+            requested = self._split(params.get('fields')) or available
+            excluded = self._split(params.get('exclude'))
+            unknown = [name for name in requested + excluded if name not in available]
+            if unknown:
+                raise ValidationError({"fields": [f"Unknown fields: {', '.join(unknown)}."]})
+            self._fieldset = [name for name in available if name in requested and name not in excluded]
+        return self._fieldset
+
+    def get_queryset(self):
+        return self.narrow_queryset(super().get_queryset())
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    def wants_field(self, name):
+        fieldset = self.get_fieldset()
+        return fieldset is None or name in fieldset
+
+    def narrow_queryset(self, queryset):
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return queryset
+        columns = {'id', *self.fieldset_extra_columns()}
+        for name in fieldset:
+            if name in self.fieldset_columns:
+                columns.update(self.fieldset_columns[name])
+                continue
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                columns.add(name)
+        return queryset.only(*columns)
+
+    def fieldset_extra_columns(self):
+        """Columns to load whatever the fieldset."""
+        return ()
+
+    @staticmethod
+    def _split(value):
+        return [name.strip() for name in (value or '').split(',') if name.strip()]
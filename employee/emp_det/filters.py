@@ -0,0 +1,107 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+RANGE_LOOKUPS = ('gte', 'lte', 'gt', 'lt')
+
+
+class ListFilter:
+    """
+    One query parameter of a list endpoint: the ORM lookup it filters on, the
+    DRF field that parses its value, and the indexed column it seeks on.
+    """
+
+    def __init__(self, lookup, field, column=None, default=None):
+        self.lookup = lookup
+        self.field = field
+        self.column = column or lookup.split('__')[0]
+        self.default = default
+        self.is_range = lookup.rsplit('__', 1)[-1] in RANGE_LOOKUPS
+
+    def parse(self, name, value):
+        try:
+            return self.field.run_validation(value)
+        except serializers.ValidationError as exc:
+            raise ValidationError({name: exc.detail})
+
+
+class ListFilterViewMixin:
+    """
+    Filtering and ``?ordering=`` for list views, limited to what an index can
+    answer.
+
+    ``list_filters`` maps query parameters to ListFilters. A combination is
+    accepted when its equality columns are the leading columns of one of
+    ``filter_indexes`` (in any order), followed by the column of at most one
+    range filter; anything else is a 400 rather than a table scan. Filters in
+    ``unindexed_filters`` ride along with any combination (low-selectivity
+    flags covered by the partial indexes). ``orderings`` whitelists the
+    ordering fields; ``id`` breaks ties.
+    """
+    list_filters = {}
+    filter_indexes = ()
+    unindexed_filters = ()
+    orderings = ('id',)
+    ordering_param = 'ordering'
+
+    def get_filter_values(self):
+        if hasattr(self, '_filter_values'):
+            return self._filter_values
+
+        values = {}
+        params = self.request.query_params
+        for name, list_filter in self.list_filters.items():
+            if name in params:
+                values[name] = list_filter.parse(name, params[name])
+            elif list_filter.default is not None:
+                values[name] = list_filter.default
+        self.check_filter_combination(values)
+        self._filter_values = values
+        return values
+
+    def check_filter_combination(self, values):
+        indexed = [name for name in values if name not in self.unindexed_filters]
+        equalities = {self.list_filters[name].column for name in indexed if not self.list_filters[name].is_range}
+        ranges = {self.list_filters[name].column for name in indexed if self.list_filters[name].is_range}
+        if not equalities and not ranges:
+            return
+        if len(ranges) <= 1:
+            for columns in self.filter_indexes:
+                prefix = columns[:len(equalities)]
+                if set(prefix) != equalities:
+                    continue
+                if not ranges or columns[len(equalities):len(equalities) + 1] == tuple(ranges):
+                    return
+        raise ValidationError({"filters": [
+            f"Unsupported filter combination: {', '.join(sorted(indexed))}. Supported: {self.describe_combinations()}."
+        ]})
+
+    def describe_combinations(self):
+        by_column = {}
+        for name, list_filter in self.list_filters.items():
+            if name not in self.unindexed_filters:
+                by_column.setdefault(list_filter.column, []).append(name)
+        return '; '.join(
+            ' + '.join('/'.join(by_column.get(column, [column])) for column in columns)
+            for columns in self.filter_indexes
+        )
+
+    def filter_list_queryset(self, queryset):
+        return queryset.filter(**{
+            self.list_filters[name].lookup: value for name, value in self.get_filter_values().items()
+        })
+
+    def get_list_ordering(self):
+        """Ordering for the keyset paginator, e.g. ``('-start_date', '-id')``."""
+        value = self.request.query_params.get(self.ordering_param, 'id')
+        name = value.lstrip('-')
+        if name not in self.orderings:
+            raise ValidationError({self.ordering_param: [
+                f"Ordering must be one of: {', '.join(self.orderings)} (prefix - for descending)."
+            ]})
+        if name == 'id':
+            return (value,)
+        return (value, '-id' if value.startswith('-') else 'id')
+
+    def fieldset_extra_columns(self):
+        # The paginator reads the ordering field of the last row.
+        return [name.lstrip('-') for name in self.get_list_ordering()]
@@ -0,0 +1,183 @@
+import functools
+import heapq
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('emp_det_request_timings', default=None)
+_query_observers = ContextVar('emp_det_query_observers', default=())
+
+
+def dispatch_queries(execute, sql, params, many, context):
+    """
+    ``execute_wrapper`` installed on every connection (see signals.py) that
+    runs the observers of the current context. Unlike
+    connection.execute_wrapper() this also reaches the queries an async
+    view runs in sync_to_async threads, which copy the context but use
+    their own connection.
+    """
+    for observer in reversed(_query_observers.get()):
+        execute = functools.partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def observe_queries(observer):
+    """Pass every SQL statement run in this context to the ``observer`` wrapper."""
+    token = _query_observers.set(_query_observers.get() + (observer,))
+    try:
+        yield
+    finally:
+        _query_observers.reset(token)
+
+
+class RequestTimings:
+    """
+    Time spent per phase of one sampled request.
+
+    Also the ``execute_wrapper`` for its database connections: every statement
+    adds to the query count and SQL time, and the slowest few are kept.
+    """
+
+    def __init__(self, slow_queries=3):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.phases = {}
+        self.slow_queries = slow_queries
+        self._slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.queries += 1
+            self.sql_ms += elapsed
+            entry = (elapsed, self.queries, sql)
+            if len(self._slowest) < self.slow_queries:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and elapsed > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def add(self, phase, elapsed_ms):
+        self.phases[phase] = self.phases.get(phase, 0.0) + elapsed_ms
+
+    def slowest(self):
+        return [{'ms': round(ms, 3), 'sql': sql} for ms, _, sql in sorted(self._slowest, reverse=True)]
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms):
+        metrics = [f'db;dur={self.sql_ms:.2f};desc="{self.queries} queries"']
+        metrics.extend(f'{phase};dur={elapsed:.2f}' for phase, elapsed in self.phases.items())
+        metrics.append(f'total;dur={total_ms:.2f}')
+        return ', '.join(metrics)
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def timed(phase):
+    """Add the block's duration to ``phase`` of the current request, if it is sampled."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, (time.perf_counter() - started) * 1000)
+
+
+class InstrumentationMiddleware:
+    """
+    Per-request SQL, auth, serialization and render timings for a sample of
+    requests, sent as a ``Server-Timing`` header and one JSON log line.
+
+    Put it first in MIDDLEWARE so the auth middleware is inside it. With
+    ``EMP_DET_INSTRUMENTATION_SAMPLE_RATE = 0`` it removes itself from the
+    chain; unsampled requests only pay for one random() call.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, 'EMP_DET_INSTRUMENTATION_SAMPLE_RATE', 0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.slow_queries = getattr(settings, 'EMP_DET_INSTRUMENTATION_SLOW_QUERIES', 3)
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        timings = RequestTimings(self.slow_queries)
+        token = _current.set(timings)
+        try:
+            with observe_queries(timings):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.report(request, response, timings)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        timings = RequestTimings(self.slow_queries)
+        token = _current.set(timings)
+        try:
+            with observe_queries(timings):
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.report(request, response, timings)
+
+    def report(self, request, response, timings):
+        total_ms = timings.total_ms()
+        response['Server-Timing'] = timings.server_timing(total_ms)
+        logger.info("request timing %s", json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 3),
+            'queries': timings.queries,
+            'sql_ms': round(timings.sql_ms, 3),
+            'phases': {phase: round(elapsed, 3) for phase, elapsed in timings.phases.items()},
+            'slowest': timings.slowest(),
+        }))
+        return response
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer that reports its time as the ``render`` phase."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .metrics import report_duration
+from .models import ReportJob
+from .reports import iter_report_rows, stream_report_xlsx
+from .versioning import data_version_stamp
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'EMP_DET_REPORT_WORKERS', 2),
+                thread_name_prefix='report-job',
+            )
+        return _executor
+
+
+def report_dir():
+    path = Path(getattr(settings, 'EMP_DET_REPORT_DIR', settings.BASE_DIR / 'reports'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def artifact_path(data_version):
+    digest = hashlib.sha1(data_version.encode('utf-8')).hexdigest()[:16]
+    return report_dir() / f"employee_report_{digest}.xlsx"
+
+
+def cached_artifact(data_version=None):
+    """Path of the finished report for the current data, or None."""
+    path = artifact_path(data_version or data_version_stamp())
+    return path if path.exists() else None
+
+
+def prune_reports(keep=None, now=None):
+    """
+    Remove report files for superseded data versions once they are older
+    than EMP_DET_REPORT_ARTIFACT_RETENTION seconds, and jobs older than
+    EMP_DET_REPORT_JOB_RETENTION. Downloads of a job whose file is gone get
+    410 until the job itself is removed. The artifact for ``keep`` (default:
+    the current data version) and its jobs stay. Returns (files, jobs) removed.
+    """
+    now = now or timezone.now()
+    keep = keep or data_version_stamp()
+    kept_path = artifact_path(keep)
+    file_cutoff = (now - timedelta(seconds=getattr(settings, 'EMP_DET_REPORT_ARTIFACT_RETENTION', 3600))).timestamp()
+    removed_files = 0
+    for path in report_dir().glob('employee_report_*.xlsx'):
+        if path != kept_path and path.stat().st_mtime < file_cutoff:
+            path.unlink(missing_ok=True)
+            removed_files += 1
+
+    job_cutoff = now - timedelta(seconds=getattr(settings, 'EMP_DET_REPORT_JOB_RETENTION', 7 * 24 * 3600))
+    removed_jobs, _ = ReportJob.objects.filter(created_at__lt=job_cutoff).exclude(data_version=keep).delete()
+    if removed_files or removed_jobs:
+        logger.info("pruned %s report files and %s report jobs", removed_files, removed_jobs)
+    return removed_files, removed_jobs
+
+
+def write_report(path):
+    tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    started = time.monotonic()
+    try:
+        with open(tmp_path, 'wb') as fh:
+            for chunk in stream_report_xlsx(iter_report_rows()):
+                fh.write(chunk)
+        os.replace(tmp_path, path)
+        report_duration.observe(time.monotonic() - started)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def run_report_job(job_id):
+    close_old_connections()
+    job = ReportJob.objects.get(pk=job_id)
+    try:
+        job.status = 'Running'
+        job.save(update_fields=['status'])
+
+        path = artifact_path(job.data_version)
+        if not path.exists():
+            write_report(path)
+
+        job.status = 'Done'
+        job.file_path = str(path)
+    except Exception as exc:
+        logger.exception("report job %s failed", job_id)
+        job.status = 'Failed'
+        job.error = str(exc)
+    finally:
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'file_path', 'error', 'finished_at'])
+        # Each data change leaves a new artifact behind; older ones go here.
+        if job.status == 'Done':
+            try:
+                prune_reports(keep=job.data_version)
+            except Exception:
+                logger.exception("pruning report artifacts failed")
+        close_old_connections()
+
+
+def submit_report_job():
+    """
+    Return a job for the current data version, reusing a finished or running
+    job when one exists, otherwise queueing a new one on the worker pool.
+    """
+    data_version = data_version_stamp()
+    # Jobs left Pending/Running by a restarted worker are not reused.
+    stale_before = timezone.now() - timedelta(seconds=getattr(settings, 'EMP_DET_REPORT_JOB_TIMEOUT', 3600))
+    existing = (
+        ReportJob.objects
+        .filter(data_version=data_version)
+        .filter(Q(status='Done') | Q(status__in=['Pending', 'Running'], created_at__gte=stale_before))
+        .order_by('-created_at')
+        .first()
+    )
+    if existing and (existing.status != 'Done' or Path(existing.file_path).exists()):
+        return existing, False
+
+    job = ReportJob.objects.create(data_version=data_version)
+    if getattr(settings, 'EMP_DET_REPORT_JOBS_EAGER', False):
+        run_report_job(job.pk)
+        job.refresh_from_db()
+    else:
+        transaction.on_commit(lambda: get_executor().submit(run_report_job, job.pk))
+    return job, True
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from emp_det.benchmarks import DEFAULT_SCALES, compare, get_thresholds, load_results, run_suite, write_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure wall time, query count and peak memory of the API hot paths on "
+        "seeded datasets, optionally failing on regressions against a baseline. "
+        "Runs in a throwaway test database; the configured database is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                            help="Employees to seed per run (three projects each).")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per scenario; the median is kept.")
+        parser.add_argument('--output', default='benchmark_results.json', help="JSON file for the results.")
+        parser.add_argument('--baseline', help="Results file to compare against.")
+        parser.add_argument('--save-baseline', metavar='PATH', help="Also write the results to PATH as a baseline.")
+        parser.add_argument('--time-threshold', type=float, help="Allowed relative wall time growth, e.g. 0.25.")
+        parser.add_argument('--memory-threshold', type=float, help="Allowed relative peak memory growth.")
+        parser.add_argument('--query-threshold', type=int, help="Allowed extra queries per request.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = load_results(options['baseline'])
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read baseline: {exc}")
+
+        # The same environment as the test runner: test client hosts allowed,
+        # and a throwaway database.
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = run_suite(scales=options['scales'], repeat=options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        write_results(results, options['output'])
+        if options['save_baseline']:
+            write_results(results, options['save_baseline'])
+
+        self.stdout.write(f"{'scenario':<30} {'scale':>7} {'wall ms':>9} {'queries':>8} {'peak KB':>9}")
+        for result in results['results']:
+            self.stdout.write(
+                f"{result['scenario']:<30} {result['scale']:>7} {result['wall_ms']:>9.2f} "
+                f"{result['queries']:>8} {result['peak_kb']:>9.1f}"
+            )
+        self.stdout.write(f"Results written to {options['output']}.")
+
+        if baseline is None:
+            return
+        regressions = compare(results, baseline, get_thresholds({
+            'wall_ms': options['time_threshold'],
+            'peak_kb': options['memory_threshold'],
+            'queries': options['query_threshold'],
+        }))
+        for regression in regressions:
+            self.stderr.write(
+                f"{regression['scenario']}@{regression['scale']} {regression['metric']}: "
+                f"{regression['current']} > {regression['limit']} (baseline {regression['baseline']})"
+            )
+        if regressions:
+            raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
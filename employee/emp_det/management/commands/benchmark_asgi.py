@@ -0,0 +1,92 @@
+import asyncio
+import random
+import statistics
+import time
+from types import ModuleType
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from emp_det.benchmarks import seed_dataset
+from emp_det.models import Project
+from emp_det.urls import build_urlpatterns
+
+
+def make_urlconf(async_views):
+    urlconf = ModuleType(f'emp_det_benchmark_urls_{async_views}')
+    urlconf.urlpatterns = build_urlpatterns(async_views)
+    return urlconf
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent read load through the ASGI handler, comparing the sync views with "
+        "the async read handlers (EMP_DET_ASYNC_VIEWS) at several concurrency levels. "
+        "Runs in a throwaway test database; the configured database is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50],
+                            help="Requests in flight at once.")
+        parser.add_argument('--requests', type=int, default=300, help="Requests per mode and concurrency level.")
+        parser.add_argument('--scale', type=int, default=500, help="Employees to seed (three projects each).")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            employee_ids = [employee.pk for employee in seed_dataset(options['scale'])]
+            project_ids = list(Project.objects.values_list('pk', flat=True))
+            urls = (
+                ['/api/employees/', '/api/projects/', '/api/employees/?fields=name,role']
+                + [f'/api/employees/{pk}/' for pk in employee_ids[:50]]
+                + [f'/api/projects/{pk}/' for pk in project_ids[:50]]
+            )
+            self.stdout.write(
+                f"{'mode':<6} {'concurrency':>11} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8}"
+            )
+            for concurrency in options['concurrency']:
+                for mode in ('sync', 'async'):
+                    result = self.run_mode(mode == 'async', urls, concurrency, options['requests'])
+                    self.stdout.write(
+                        f"{mode:<6} {concurrency:>11} {result['requests_per_second']:>8.1f} {result['errors']:>7} "
+                        f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}"
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def run_mode(self, async_views, urls, concurrency, total):
+        # Measure the views, not the response cache or the sampled timings.
+        with override_settings(ROOT_URLCONF=make_urlconf(async_views), EMP_DET_RESPONSE_CACHE_ENABLED=False,
+                               EMP_DET_INSTRUMENTATION_SAMPLE_RATE=0):
+            return asyncio.run(self.load(AsyncClient(), urls, concurrency, total))
+
+    async def load(self, client, urls, concurrency, total):
+        rng = random.Random(0)
+        paths = [rng.choice(urls) for _ in range(total)]
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, errors = [], 0
+
+        async def fetch(path):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                if response.status_code >= 500:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch(path) for path in paths))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'errors': errors,
+            'requests_per_second': total / elapsed,
+            'p50_ms': statistics.median(latencies),
+            'p95_ms': latencies[int(len(latencies) * 0.95)],
+        }
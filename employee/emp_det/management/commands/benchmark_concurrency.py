@@ -0,0 +1,120 @@
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from emp_det.benchmarks import seed_dataset
+from emp_det.models import Employee, Project
+
+
+def read_op(rng, ids):
+    list(Employee.objects.with_project_counts().filter(pk__gte=rng.choice(ids)).order_by('pk')[:50])
+
+
+def write_op(rng, ids):
+    # Read-then-write in one transaction: the pattern that hits "database is
+    # locked" when a deferred transaction has to upgrade its lock.
+    with transaction.atomic():
+        employee = Employee.objects.get(pk=rng.choice(ids))
+        Project.objects.filter(employee=employee).update(status=rng.choice(('Ongoing', 'Done')))
+
+
+class Command(BaseCommand):
+    help = (
+        "Mixed read/write throughput of each SQLite profile in EMP_DET_SQLITE_PROFILES, "
+        "measured with worker threads against a scratch database file per profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', default=list(settings.EMP_DET_SQLITE_PROFILES))
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=5.0, help="Run time per profile.")
+        parser.add_argument('--write-ratio', type=float, default=0.2, help="Share of operations that write.")
+        parser.add_argument('--scale', type=int, default=1000, help="Employees to seed (three projects each).")
+
+    def handle(self, *args, **options):
+        unknown = set(options['profiles']) - set(settings.EMP_DET_SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(sorted(unknown))}")
+
+        self.stdout.write(
+            f"{'profile':<8} {'ops/s':>8} {'reads':>7} {'writes':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8}"
+        )
+        for profile in options['profiles']:
+            with tempfile.TemporaryDirectory() as directory:
+                result = self.run_profile(profile, Path(directory) / 'bench.sqlite3', options)
+            self.stdout.write(
+                f"{profile:<8} {result['ops_per_second']:>8.1f} {result['reads']:>7} {result['writes']:>7} "
+                f"{result['errors']:>7} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}"
+            )
+
+    def run_profile(self, profile, path, options):
+        # Point the default alias at a scratch file with this profile; every
+        # thread builds its own connection from these settings.
+        original = dict(connections.settings['default'])
+        scratch = {**original, 'NAME': str(path), 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'PRAGMAS': {}}
+        scratch.update(settings.EMP_DET_SQLITE_PROFILES[profile])
+        connections['default'].close()
+        del connections['default']
+        connections.settings['default'].clear()
+        connections.settings['default'].update(scratch)
+        try:
+            call_command('migrate', verbosity=0, interactive=False)
+            ids = [employee.pk for employee in seed_dataset(options['scale'])]
+            connections['default'].close()
+            return self.run_workers(ids, options)
+        finally:
+            connections['default'].close()
+            del connections['default']
+            connections.settings['default'].clear()
+            connections.settings['default'].update(original)
+
+    def run_workers(self, ids, options):
+        deadline = time.monotonic() + options['seconds']
+        latencies, counts, lock = [], {'reads': 0, 'writes': 0, 'errors': 0}, threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            local, reads, writes, errors = [], 0, 0, 0
+            try:
+                while time.monotonic() < deadline:
+                    write = rng.random() < options['write_ratio']
+                    started = time.perf_counter()
+                    try:
+                        (write_op if write else read_op)(rng, ids)
+                    except OperationalError:
+                        errors += 1
+                        continue
+                    local.append((time.perf_counter() - started) * 1000)
+                    if write:
+                        writes += 1
+                    else:
+                        reads += 1
+            finally:
+                connections.close_all()
+            with lock:
+                latencies.extend(local)
+                counts['reads'] += reads
+                counts['writes'] += writes
+                counts['errors'] += errors
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        return {
+            **counts,
+            'ops_per_second': (counts['reads'] + counts['writes']) / options['seconds'],
+            'p50_ms': statistics.median(latencies) if latencies else 0.0,
+            'p95_ms': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+        }
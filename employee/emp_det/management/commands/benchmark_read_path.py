@@ -0,0 +1,73 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from emp_det.fastpath import get_read_plan
+from emp_det.models import Address, Employee, Project
+from emp_det.serializers import EmployeeGetSerializer, ProjectGetSerializer
+from emp_det.views import EmployeeListCreateAPIView
+
+
+def employee_fixtures(count):
+    instances, rows = [], []
+    for i in range(count):
+        address = Address(add_line=f'{i} Main Road', state='Kerala', hometown='Kochi', pincode='682001')
+        employee = Employee(id=i + 1, name=f'Employee {i}', role='Dev', company='Acme', phone=['9876543210'],
+                            address=address)
+        employee.project_total, employee.project_ongoing, employee.project_done = 3, 2, 1
+        instances.append(employee)
+        rows.append({
+            'id': i + 1, 'name': employee.name, 'role': 'Dev', 'company': 'Acme', 'phone': ['9876543210'],
+            'address__add_line': address.add_line, 'address__state': 'Kerala', 'address__hometown': 'Kochi',
+            'address__pincode': '682001', 'project_total': 3, 'project_ongoing': 2, 'project_done': 1,
+        })
+    return instances, rows
+
+
+def project_fixtures(count):
+    start = timezone.now()
+    instances, rows = [], []
+    for i in range(count):
+        project = Project(id=i + 1, title=f'Project {i}', description='Benchmark', start_date=start,
+                          end_date=start + timedelta(days=30), status='Ongoing')
+        instances.append(project)
+        rows.append({
+            'id': i + 1, 'title': project.title, 'description': 'Benchmark', 'start_date': project.start_date,
+            'end_date': project.end_date, 'status': 'Ongoing',
+        })
+    return instances, rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the DRF read serializers with the values()-based read plans on "
+        "in-memory rows (serialization only, no database access)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=3, help="Best of N runs is reported.")
+
+    def best_of(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def handle(self, *args, **options):
+        cases = [
+            ('employees', employee_fixtures, EmployeeGetSerializer,
+             get_read_plan(EmployeeGetSerializer, method_sources=EmployeeListCreateAPIView.count_annotations)),
+            ('projects', project_fixtures, ProjectGetSerializer, get_read_plan(ProjectGetSerializer)),
+        ]
+        self.stdout.write(f"{'data':<10} {'rows':>8} {'serializer s':>13} {'read plan s':>12} {'speedup':>8}")
+        for label, fixtures, serializer_class, plan in cases:
+            for count in options['rows']:
+                instances, rows = fixtures(count)
+                slow = self.best_of(options['repeat'], lambda: serializer_class(instances, many=True).data)
+                fast = self.best_of(options['repeat'], lambda: plan.serialize_many(rows))
+                self.stdout.write(f"{label:<10} {count:>8} {slow:>13.4f} {fast:>12.4f} {slow / fast:>7.1f}x")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from emp_det.bulk import LOOKUP_CHUNK_SIZE, close_expired_projects
+
+
+class Command(BaseCommand):
+    help = (
+        "Set every Ongoing project whose end_date has passed to Done, in batched "
+        "set-based UPDATEs. Meant to run from cron or another scheduler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=LOOKUP_CHUNK_SIZE, help="Rows per UPDATE.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the expired projects.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        closed = close_expired_projects(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        verb = "would be closed" if options['dry_run'] else "closed"
+        self.stdout.write(self.style.SUCCESS(f"{closed} expired projects {verb}."))
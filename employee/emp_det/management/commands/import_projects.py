@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from emp_det.bulk import import_projects, iter_project_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import projects from a CSV or XLSX file with columns title, description, "
+        "start_date, end_date, status and employee (id or name)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to a .csv or .xlsx file.")
+        parser.add_argument('--batch-size', type=int, default=None, help="Rows per lookup/INSERT batch (max 500).")
+        parser.add_argument('--dry-run', action='store_true', help="Validate every row without inserting.")
+
+    def handle(self, *args, **options):
+        def report_error(line, errors):
+            details = "; ".join(f"{field}: {' '.join(str(m) for m in messages)}" for field, messages in errors.items())
+            self.stderr.write(f"line {line}: {details}")
+
+        try:
+            rows = iter_project_rows(options['path'])
+            summary = import_projects(
+                rows, batch_size=options['batch_size'], dry_run=options['dry_run'], on_error=report_error
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        verb = "would be created" if options['dry_run'] else "created"
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['read']} rows read, {summary['created']} projects {verb}, {summary['failed']} rejected."
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from emp_det.jobs import prune_reports
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove report files of superseded data versions and old report jobs, per "
+        "EMP_DET_REPORT_ARTIFACT_RETENTION and EMP_DET_REPORT_JOB_RETENTION. Finished "
+        "jobs already prune after themselves; this covers idle periods."
+    )
+
+    def handle(self, *args, **options):
+        files, jobs = prune_reports()
+        self.stdout.write(self.style.SUCCESS(f"Removed {files} report files and {jobs} report jobs."))
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from emp_det.purge import Archive, count_purgeable, default_archive_path, purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive soft-deleted employees and projects older than the retention window, "
+        "and orphaned addresses, to a gzipped JSON Lines file, then hard-delete them in "
+        "small batches. Safe to interrupt and run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=float, default=settings.EMP_DET_PURGE_RETENTION_DAYS,
+                            help="Purge rows deleted more than this many days ago.")
+        parser.add_argument('--batch-size', type=int, default=settings.EMP_DET_PURGE_BATCH_SIZE,
+                            help="Rows per transaction.")
+        parser.add_argument('--pause', type=float, default=settings.EMP_DET_PURGE_PAUSE,
+                            help="Seconds to sleep between batches.")
+        parser.add_argument('--archive', help="Archive file to append to (default: a new file in EMP_DET_ARCHIVE_DIR).")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the rows that would be purged.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        cutoff = timezone.now() - timedelta(days=options['retention_days'])
+
+        if options['dry_run']:
+            counts = count_purgeable(cutoff)
+            self.stdout.write(", ".join(f"{count} {name}" for name, count in counts.items()) + " would be purged.")
+            return
+
+        path = options['archive'] or default_archive_path(settings.EMP_DET_ARCHIVE_DIR)
+        try:
+            archive = Archive(path)
+        except OSError as exc:
+            raise CommandError(f"Cannot open archive: {exc}")
+        with archive:
+            totals = purge_deleted(
+                archive, cutoff, batch_size=options['batch_size'], pause=options['pause'],
+                on_batch=self.report_batch if options['verbosity'] > 1 else None,
+            )
+        self.stdout.write(self.style.SUCCESS(
+            ", ".join(f"{count} {name}" for name, count in totals.items()) + f" purged; archived to {path}."
+        ))
+
+    def report_batch(self, removed):
+        self.stdout.write(", ".join(f"{count} {name}" for name, count in removed.items()) + " purged.")
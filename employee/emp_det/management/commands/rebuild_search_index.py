@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from emp_det import search
+
+
+class Command(BaseCommand):
+    help = "Refill the full-text index from the live rows."
+
+    def handle(self, *args, **options):
+        if not search.is_installed():
+            raise CommandError("The search index needs SQLite with FTS5 and emp_det migrated (see 0019_search_index).")
+        counts = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Search index rebuilt: {counts[search.EMPLOYEE_INDEX]} employees, "
+            f"{counts[search.PROJECT_INDEX]} projects."
+        ))
@@ -1,22 +1,64 @@
 from django.db import models
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .versioning import bump_version, coalesced_bumps
+
+# Project counter annotations added by with_project_counts().
+PROJECT_COUNT_FILTERS = {
+    'project_total': Q(),
+    'project_ongoing': Q(projects__status='Ongoing'),
+    'project_done': Q(projects__status='Done'),
+}
 
 class SoftDeleteQuerySet(models.QuerySet):
-    def delete(self):
-        return super().update(is_deleted=True)
+    # Queryset writes don't send post_save/post_delete, so they bump the
+    # row versions and the data version themselves.
+    def update(self, **kwargs):
+        kwargs.setdefault('version', F('version') + 1)
+        kwargs.setdefault('updated_at', timezone.now())
+        rows = super().update(**kwargs)
+        if rows:
+            bump_version(self.model)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if objs:
+            bump_version(self.model)
+        return objs
+
+    def delete(self, deleted_at=None):
+        # Only live rows, so deleted_at keeps the time of the first delete.
+        return self.alive().update(is_deleted=True, deleted_at=deleted_at or timezone.now())
 
     def hard_delete(self):
-        return super().delete()
+        with coalesced_bumps():
+            return super().delete()
 
     def restore(self):
-        return self.update(is_deleted=False)
+        return self.dead().update(is_deleted=False, deleted_at=None)
 
     def alive(self):
         return self.filter(is_deleted=False)
 
     def dead(self):
         return self.filter(is_deleted=True)
-    
-    
+
+    def with_project_counts(self, counts=None, address=True):
+        # One grouped LEFT JOIN instead of three COUNT queries per employee.
+        # ``counts`` limits the annotations to the named ones, ``address``
+        # controls the select_related join.
+        alive = Q(projects__is_deleted=False)
+        queryset = self.select_related('address') if address else self
+        annotations = {
+            name: Count('projects', filter=alive & condition)
+            for name, condition in PROJECT_COUNT_FILTERS.items()
+            if counts is None or name in counts
+        }
+        return queryset.annotate(**annotations) if annotations else queryset
+
+
 
 class SoftDeleteManager(models.Manager):
     def get_queryset(self):
@@ -28,5 +70,12 @@ class SoftDeleteManager(models.Manager):
     def get_all_objects(self):
         return self.get_queryset().alive()
 
+    def all_objects(self):
+        # Deleted rows included; get_queryset() already filters them out.
+        return SoftDeleteQuerySet(self.model, using=self._db)
+
     def deleted_objects(self):
-        return self.get_queryset().dead()
+        return self.all_objects().dead()
+
+    def with_project_counts(self, counts=None, address=True):
+        return self.get_queryset().with_project_counts(counts, address)
@@ -0,0 +1,255 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import observe_queries
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+REPORT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class Metric:
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.samples = {}
+        registry.register(self)
+
+    def label_values(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.label_values(labels)
+        with self.registry.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+        self.registry.changed()
+
+
+class Histogram(Metric):
+    """Samples are ``[bucket counts..., +Inf count, sum]`` per label set."""
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(registry, name, documentation, labelnames)
+
+    def observe(self, value, **labels):
+        key = self.label_values(labels)
+        with self.registry.lock:
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = self.samples[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample[index] += 1
+                    break
+            else:
+                sample[-2] += 1
+            sample[-1] += value
+        self.registry.changed()
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms, rendered in the Prometheus text format.
+
+    With ``EMP_DET_METRICS_DIR`` set, each worker process writes its samples
+    to ``<dir>/metrics_<pid>.json`` (atomically, at most every
+    ``EMP_DET_METRICS_FLUSH_INTERVAL`` seconds and at exit), and collect()
+    sums the files of every process, so any worker can answer /metrics.
+    Clear the directory when the service is restarted.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def directory(self):
+        path = getattr(settings, 'EMP_DET_METRICS_DIR', None)
+        return Path(path) if path else None
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: [[list(key), list(value) if isinstance(value, list) else value]
+                       for key, value in metric.samples.items()]
+                for name, metric in self.metrics.items()
+            }
+
+    def changed(self):
+        interval = getattr(settings, 'EMP_DET_METRICS_FLUSH_INTERVAL', 1.0)
+        if self.directory() is not None and time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def flush(self):
+        directory = self.directory()
+        if directory is None:
+            return
+        self._last_flush = time.monotonic()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'metrics_{os.getpid()}.json'
+        tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        try:
+            tmp_path.write_text(json.dumps(self.snapshot()))
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.exception("could not write metrics file %s", path)
+
+    def collect(self):
+        """Samples of this process, or of every process in multiprocess mode."""
+        directory = self.directory()
+        if directory is None:
+            return self.snapshot()
+        self.flush()
+        merged = {}
+        for path in directory.glob('metrics_*.json'):
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                # Removed or replaced while we were reading it.
+                continue
+            for name, samples in snapshot.items():
+                totals = merged.setdefault(name, {})
+                for key, value in samples:
+                    key = tuple(key)
+                    if isinstance(value, list):
+                        current = totals.get(key, [0] * len(value))
+                        totals[key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        totals[key] = totals.get(key, 0) + value
+        return {name: [[list(key), value] for key, value in samples.items()] for name, samples in merged.items()}
+
+    def render(self):
+        collected = self.collect()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for key, value in sorted(collected.get(name, []), key=lambda sample: sample[0]):
+                labels = list(zip(metric.labelnames, key))
+                if metric.type == 'counter':
+                    lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + ('+Inf',), value[:-1]):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else format_value(bound)
+                    lines.append(f'{name}_bucket{format_labels(labels + [("le", le)])} {cumulative}')
+                lines.append(f'{name}_sum{format_labels(labels)} {format_value(value[-1])}')
+                lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
+
+http_requests = Counter(
+    registry, 'emp_det_http_requests_total', 'HTTP requests by view, method and status.',
+    ('view', 'method', 'status'),
+)
+http_duration = Histogram(
+    registry, 'emp_det_http_request_duration_seconds', 'HTTP request latency by view and method.',
+    ('view', 'method'),
+)
+db_queries = Counter(
+    registry, 'emp_det_db_queries_total', 'SQL statements executed while handling requests, by view.', ('view',),
+)
+cache_requests = Counter(
+    registry, 'emp_det_cache_requests_total', 'Cache lookups by cache and result (hit or miss).',
+    ('cache', 'result'),
+)
+report_duration = Histogram(
+    registry, 'emp_det_report_generation_seconds', 'Time to build an XLSX report artifact.', (),
+    buckets=REPORT_BUCKETS,
+)
+
+
+class QueryCounter:
+    """``execute_wrapper`` that only counts statements."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Request count, latency and SQL statement count per view. Views are
+    labelled by URL name, so path parameters do not multiply the series.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'EMP_DET_METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with observe_queries(counter):
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, counter.count)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with observe_queries(counter):
+            response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, counter.count)
+        return response
+
+    def record(self, request, response, elapsed, queries):
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        http_requests.inc(view=view, method=request.method, status=response.status_code)
+        http_duration.observe(elapsed, view=view, method=request.method)
+        if queries:
+            db_queries.inc(queries, view=view)
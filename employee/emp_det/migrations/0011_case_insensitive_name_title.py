@@ -0,0 +1,32 @@
+# Generated by Django 5.0.7 on 2026-10-17 20:10
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emp_det', '0010_dataversion_reportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employee',
+            name='name',
+            field=models.CharField(blank=True, max_length=240),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='title',
+            field=models.CharField(blank=True, max_length=240),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='employee_name_ci_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('title'), name='project_title_ci_unique'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.7 on 2026-10-17 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emp_det', '0011_case_insensitive_name_title'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['id'], name='employee_alive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('active', True), ('is_deleted', False)), fields=['id'], name='employee_alive_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['id'], name='project_alive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['employee', 'status'], name='project_alive_emp_status_idx'),
+        ),
+    ]
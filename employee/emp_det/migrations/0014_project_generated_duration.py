@@ -0,0 +1,29 @@
+# Generated by Django 5.0.7 on 2026-10-17 20:32
+
+import django.db.models.expressions
+import emp_det.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emp_det', '0013_row_version_updated_at'),
+    ]
+
+    operations = [
+        # A column cannot become generated in place.
+        migrations.RemoveField(
+            model_name='project',
+            name='duration',
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='duration',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(emp_det.models.UnixEpoch('end_date'), '-', emp_det.models.UnixEpoch('start_date')), '/', models.Value(86400)), output_field=models.IntegerField()),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gte', models.F('start_date'))), name='project_end_after_start'),
+        ),
+    ]
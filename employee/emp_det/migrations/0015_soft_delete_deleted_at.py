@@ -0,0 +1,31 @@
+# Generated by Django 5.0.7 on 2026-10-17 20:34
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_deleted_at(apps, schema_editor):
+    # The last modification is the best guess for rows deleted before this field.
+    for name in ('Employee', 'Project'):
+        apps.get_model('emp_det', name).objects.filter(is_deleted=True).update(deleted_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emp_det', '0014_project_generated_duration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.7 on 2026-10-17 20:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emp_det', '0015_soft_delete_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='employee_deleted_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='project_deleted_at_idx'),
+        ),
+    ]
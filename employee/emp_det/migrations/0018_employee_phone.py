@@ -0,0 +1,78 @@
+# Generated by Django 5.0.7 on 2026-10-17 20:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# emp_det_employeephone holds one row per number in Employee.phone, kept in
+# sync by triggers so bulk inserts and queryset updates of the JSON list are
+# covered; deletes cascade through the foreign key. SQLite drops a table's
+# triggers when a migration rebuilds it, so later migrations rebuilding
+# emp_det_employee must create these again. Any existing triggers of the same
+# name (from the former post_migrate hook) are replaced.
+#
+# Numbers are stored like emp_det.phones.normalize_phone() returns them:
+# separators and the 0091/91/0 prefix stripped, only 10-digit results kept.
+DIGITS = (
+    "replace(replace(replace(replace(replace(replace("
+    "j.value, ' ', ''), '(', ''), ')', ''), '.', ''), '+', ''), '-', '')"
+)
+NATIONAL_NUMBER = (
+    "CASE WHEN length(digits) = 14 AND digits GLOB '0091*' THEN substr(digits, 5) "
+    "WHEN length(digits) = 12 AND digits GLOB '91*' THEN substr(digits, 3) "
+    "WHEN length(digits) = 11 AND digits GLOB '0*' THEN substr(digits, 2) "
+    "ELSE digits END"
+)
+
+
+def phone_rows(condition="1"):
+    return (
+        "INSERT OR IGNORE INTO emp_det_employeephone(employee_id, number) "
+        f"SELECT employee_id, number FROM (SELECT employee_id, {NATIONAL_NUMBER} AS number FROM ("
+        f"SELECT e.id AS employee_id, {DIGITS} AS digits FROM emp_det_employee e, json_each(e.phone) j "
+        f"WHERE j.type = 'text' AND {condition})) WHERE number GLOB '{'[0-9]' * 10}'"
+    )
+
+
+TRIGGERS = {
+    'emp_det_employee_phone_ai': (
+        f"AFTER INSERT ON emp_det_employee BEGIN {phone_rows('e.id = new.id')}; END"
+    ),
+    'emp_det_employee_phone_au': (
+        "AFTER UPDATE OF phone ON emp_det_employee WHEN old.phone IS NOT new.phone BEGIN "
+        "DELETE FROM emp_det_employeephone WHERE employee_id = old.id; "
+        f"{phone_rows('e.id = new.id')}; END"
+    ),
+}
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emp_det', '0017_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeePhone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.CharField(max_length=20)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='phone_numbers', to='emp_det.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['number'], name='employee_phone_number_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='employeephone',
+            constraint=models.UniqueConstraint(fields=('employee', 'number'), name='employee_phone_unique'),
+        ),
+        migrations.RunSQL(
+            sql=[f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS] + [
+                f"CREATE TRIGGER {name} {body}" for name, body in TRIGGERS.items()
+            ] + [
+                "DELETE FROM emp_det_employeephone",
+                phone_rows(),
+            ],
+            reverse_sql=[f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS],
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.0.7 on 2026-10-17 21:05
+
+from django.db import migrations
+
+# SQLite FTS5 tables keyed on the row id, kept in sync by triggers so queryset
+# updates, bulk inserts and soft deletes are covered too. Only live rows are
+# indexed; the employee document includes its address' hometown and state.
+# SQLite drops a table's triggers when a migration rebuilds it (AlterField and
+# friends), so later migrations touching emp_det_employee, emp_det_address or
+# emp_det_project must create the triggers they lost again. IF NOT EXISTS
+# because databases set up before this migration got the tables and triggers
+# from a post_migrate hook; the index is refilled either way.
+EMPLOYEE_ROWS = (
+    "INSERT INTO emp_det_employee_search(rowid, name, role, company, hometown, state) "
+    "SELECT e.id, e.name, e.role, e.company, a.hometown, a.state FROM emp_det_employee e "
+    "LEFT JOIN emp_det_address a ON a.id = e.address_id WHERE e.is_deleted = 0"
+)
+PROJECT_ROWS = (
+    "INSERT INTO emp_det_project_search(rowid, title, description) "
+    "SELECT p.id, p.title, p.description FROM emp_det_project p WHERE p.is_deleted = 0"
+)
+
+TABLES = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS emp_det_employee_search USING fts5("
+    "name, role, company, hometown, state, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS emp_det_project_search USING fts5("
+    "title, description, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+]
+
+TRIGGERS = {
+    'emp_det_employee_search_ai': (
+        "AFTER INSERT ON emp_det_employee WHEN new.is_deleted = 0 BEGIN "
+        f"{EMPLOYEE_ROWS} AND e.id = new.id; END"
+    ),
+    'emp_det_employee_search_au': (
+        "AFTER UPDATE OF name, role, company, address_id, is_deleted ON emp_det_employee BEGIN "
+        "DELETE FROM emp_det_employee_search WHERE rowid = old.id; "
+        f"{EMPLOYEE_ROWS} AND e.id = new.id; END"
+    ),
+    'emp_det_employee_search_ad': (
+        "AFTER DELETE ON emp_det_employee BEGIN DELETE FROM emp_det_employee_search WHERE rowid = old.id; END"
+    ),
+    'emp_det_address_search_au': (
+        "AFTER UPDATE OF hometown, state ON emp_det_address BEGIN "
+        "DELETE FROM emp_det_employee_search WHERE rowid IN (SELECT id FROM emp_det_employee WHERE address_id = new.id); "
+        f"{EMPLOYEE_ROWS} AND e.address_id = new.id; END"
+    ),
+    'emp_det_project_search_ai': (
+        "AFTER INSERT ON emp_det_project WHEN new.is_deleted = 0 BEGIN "
+        f"{PROJECT_ROWS} AND p.id = new.id; END"
+    ),
+    'emp_det_project_search_au': (
+        "AFTER UPDATE OF title, description, is_deleted ON emp_det_project BEGIN "
+        "DELETE FROM emp_det_project_search WHERE rowid = old.id; "
+        f"{PROJECT_ROWS} AND p.id = new.id; END"
+    ),
+    'emp_det_project_search_ad': (
+        "AFTER DELETE ON emp_det_project BEGIN DELETE FROM emp_det_project_search WHERE rowid = old.id; END"
+    ),
+}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emp_det', '0018_employee_phone'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=TABLES + [f"CREATE TRIGGER IF NOT EXISTS {name} {body}" for name, body in TRIGGERS.items()] + [
+                "DELETE FROM emp_det_employee_search",
+                EMPLOYEE_ROWS,
+                "DELETE FROM emp_det_project_search",
+                PROJECT_ROWS,
+            ],
+            reverse_sql=[f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS] + [
+                "DROP TABLE IF EXISTS emp_det_employee_search",
+                "DROP TABLE IF EXISTS emp_det_project_search",
+            ],
+        ),
+    ]
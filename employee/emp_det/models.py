@@ -1,25 +1,95 @@
+import uuid
+
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.db.models.functions import Lower
+from django.utils import timezone
 from .managers import SoftDeleteManager
 
-class SoftDeleteModel(models.Model):
+class VersionConflict(Exception):
+    """The row is no longer at the version a conditional save expected."""
+
+class VersionedModel(models.Model):
+    # Row version and modification time behind the ETag/Last-Modified headers.
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Set by expect_version() for the next save() only.
+    _expected_version = None
+
+    class Meta:
+        abstract = True
+
+    def expect_version(self, version):
+        """
+        Make the next save() update the row only while it is still at
+        ``version``, raising VersionConflict otherwise (optimistic locking).
+        """
+        self._expected_version = version
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'version', 'updated_at'}
+        expected = self._expected_version
+        previous = self.version
+        # Incremented in SQL, so concurrent saves never write the same version.
+        self.version = models.F('version') + 1
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            self.version = previous
+            raise
+        finally:
+            self._expected_version = None
+        if expected is not None:
+            self.version = expected + 1
+        else:
+            # Loaded again on access.
+            self.__dict__.pop('version', None)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = self._expected_version
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if not super()._do_update(base_qs.filter(version=expected), using, pk_val, values, update_fields, True):
+            raise VersionConflict(f"{type(self).__name__} {pk_val} is not at version {expected}.")
+        return True
+
+class UnixEpoch(models.Func):
+    """SQLite's unixepoch(): whole seconds since 1970-01-01 (SQLite 3.38+)."""
+    function = 'unixepoch'
+    output_field = models.IntegerField()
+
+class SoftDeleteModel(VersionedModel):
     is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         abstract = True
 
 # Create your models here.
-class Address(models.Model):
+class Address(VersionedModel):
     add_line = models.CharField(max_length=255, blank=True, null=False)
     state = models.CharField(max_length=100, blank=True, null=False)
     hometown = models.CharField(max_length=100, blank=True, null=False)
     pincode = models.CharField(max_length=6, blank=True, null=False)
 
+    class Meta:
+        # Behind the employee list's state/pincode filters.
+        indexes = [
+            models.Index(fields=['state', 'pincode'], name='address_state_pincode_idx'),
+            models.Index(fields=['pincode'], name='address_pincode_idx'),
+        ]
+
     def __str__(self):
         return f"{self.add_line}, {self.hometown}, {self.state}, {self.pincode}"
 
 class Employee(SoftDeleteModel):
-    name = models.CharField(max_length=240, unique=True, null=False, blank=True)
+    name = models.CharField(max_length=240, null=False, blank=True)
     phone = models.JSONField(default=list, null=False, blank=True)
 
     company = models.TextField(max_length=240, null=False, blank=True)
@@ -27,6 +97,26 @@ class Employee(SoftDeleteModel):
     active = models.BooleanField(default=True, null=False, blank=True)
     address = models.OneToOneField(Address, on_delete=models.CASCADE, null=False, blank=True, default=1)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(Lower('name'), name='employee_name_ci_unique'),
+        ]
+        # Partial indexes matching SoftDeleteManager: alive rows, and the
+        # alive-and-active rows behind the employee list.
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(is_deleted=False), name='employee_alive_idx'),
+            models.Index(
+                fields=['id'], condition=models.Q(is_deleted=False, active=True), name='employee_alive_active_idx'
+            ),
+            # Deleted rows by age, for the purge command.
+            models.Index(fields=['deleted_at'], condition=models.Q(is_deleted=True), name='employee_deleted_at_idx'),
+            # The employee list's company/role filters.
+            models.Index(
+                fields=['company', 'role'], condition=models.Q(is_deleted=False), name='employee_company_role_idx'
+            ),
+            models.Index(fields=['role'], condition=models.Q(is_deleted=False), name='employee_role_idx'),
+        ]
+
     def delete(self, *args, **kwargs):  
         if self.address:
             self.address.delete()
@@ -36,10 +126,12 @@ class Employee(SoftDeleteModel):
 
     def soft_delete(self, *args, **kwargs):
         self.is_deleted = True
+        self.deleted_at = timezone.now()
         self.save()
 
     def restore(self):
         self.is_deleted = False
+        self.deleted_at = None
         self.save()
 
     @staticmethod
@@ -58,31 +150,84 @@ class Employee(SoftDeleteModel):
     def __str__(self):
         return self.name
 
+class EmployeePhone(models.Model):
+    """
+    One row per number in Employee.phone, written by database triggers (see
+    phones.py) rather than by the application.
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='phone_numbers')
+    number = models.CharField(max_length=20)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'number'], name='employee_phone_unique'),
+        ]
+        # Reverse lookups and duplicate checks seek on the number.
+        indexes = [
+            models.Index(fields=['number'], name='employee_phone_number_idx'),
+        ]
+
+    def __str__(self):
+        return self.number
+
 class Project(SoftDeleteModel):
     STATUS_CHOICES = (
         ('Ongoing', 'Ongoing'),
         ('Done', 'Done'),
     )
     
-    title = models.CharField(max_length=240, unique=True, null=False, blank=True)
+    title = models.CharField(max_length=240, null=False, blank=True)
     description = models.TextField(max_length=240, null=False, blank=True)
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
-    duration = models.IntegerField(default=0, null=False, blank=True)
+    # Whole days from start to end, kept current by the database itself,
+    # including for queryset updates of the dates.
+    duration = models.GeneratedField(
+        expression=(UnixEpoch('end_date') - UnixEpoch('start_date')) / 86400,
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='projects', null=False, blank=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Ongoing', null=False, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(Lower('title'), name='project_title_ci_unique'),
+            models.CheckConstraint(check=models.Q(end_date__gte=models.F('start_date')), name='project_end_after_start'),
+        ]
+        # Alive projects, and alive projects per employee by status.
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(is_deleted=False), name='project_alive_idx'),
+            models.Index(
+                fields=['employee', 'status'], condition=models.Q(is_deleted=False), name='project_alive_emp_status_idx'
+            ),
+            models.Index(fields=['deleted_at'], condition=models.Q(is_deleted=True), name='project_deleted_at_idx'),
+            # The project list's status and date range filters.
+            models.Index(
+                fields=['status', 'start_date'], condition=models.Q(is_deleted=False), name='project_status_start_idx'
+            ),
+            models.Index(
+                fields=['status', 'end_date'], condition=models.Q(is_deleted=False), name='project_status_end_idx'
+            ),
+            models.Index(fields=['start_date'], condition=models.Q(is_deleted=False), name='project_start_idx'),
+            models.Index(fields=['end_date'], condition=models.Q(is_deleted=False), name='project_end_idx'),
+        ]
+
     def save(self, *args, **kwargs):
-        if self.start_date and self.end_date:
-            self.duration = (self.end_date - self.start_date).days
-            if self.duration < 0:
-                raise ValidationError("End date must be after the start date.")
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise ValidationError("End date must be after the start date.")
+        adding = self._state.adding
         super().save(*args, **kwargs)
+        if not adding:
+            # Inserts return the generated duration; after an update it is
+            # reloaded on next access.
+            self.__dict__.pop('duration', None)
     
     objects = SoftDeleteManager()
 
     def delete(self, *args, **kwargs):
         self.is_deleted = True
+        self.deleted_at = timezone.now()
         self.save()
 
     @staticmethod
@@ -95,3 +240,32 @@ class Project(SoftDeleteModel):
 
     def __str__(self):
         return self.title
+
+
+class DataVersion(models.Model):
+    """Generation counter per model, bumped on every write (see versioning.py)."""
+    name = models.CharField(max_length=100, unique=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}@{self.version}"
+
+
+class ReportJob(models.Model):
+    STATUS_CHOICES = (
+        ('Pending', 'Pending'),
+        ('Running', 'Running'),
+        ('Done', 'Done'),
+        ('Failed', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Pending')
+    data_version = models.CharField(max_length=255)
+    file_path = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
@@ -0,0 +1,177 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination, _positive_int, _reverse_ordering
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def int_query_param(request, name, default, strict=True, cutoff=None):
+    """
+    An integer query parameter, capped at ``cutoff``: positive, or with
+    ``strict=False`` zero or more. A malformed value is a 400, like a bad
+    filter value, rather than a silent fallback to the default.
+    """
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        return _positive_int(value, strict=strict, cutoff=cutoff)
+    except ValueError:
+        kind = 'A positive integer' if strict else 'A non-negative integer'
+        raise ValidationError({name: [f"{kind} is required."]})
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a unique, indexed key so every page costs the same
+    ``WHERE id > ? ORDER BY id LIMIT n`` query, however deep the client pages.
+
+    The total row count is sent in the ``X-Total-Count`` header. It costs one
+    extra ``COUNT(*)`` per page, so it can be switched off globally with
+    ``EMP_DET_PAGINATION_COUNT = False`` or per request with ``?count=false``.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    count_query_param = 'count'
+    count_header = 'X-Total-Count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.total_count = None
+        if self.include_count(request):
+            self.total_count = self.get_count_queryset(queryset, view).count()
+        window = self.page_window(queryset, request, view)
+        if window is None:
+            return None
+        return self.set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views, using acount() and async iteration."""
+        self.total_count = None
+        if self.include_count(request):
+            self.total_count = await self.get_count_queryset(queryset, view).acount()
+        window = self.page_window(queryset, request, view)
+        if window is None:
+            return None
+        return self.set_page([item async for item in window])
+
+    def get_page_size(self, request):
+        # Capped at max_page_size; a malformed value is a 400.
+        return int_query_param(request, self.page_size_query_param, self.page_size, cutoff=self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        # Views with ListFilterViewMixin pick among their whitelisted orderings.
+        if hasattr(view, 'get_list_ordering'):
+            return view.get_list_ordering()
+        return super().get_ordering(request, queryset, view)
+
+    def get_count_queryset(self, queryset, view):
+        # Views can count a plainer queryset than the one they page
+        # through, e.g. without joins and aggregate annotations.
+        return getattr(view, 'get_count_queryset', lambda: queryset)()
+
+    # CursorPagination.paginate_queryset() split around its one query, so the
+    # sync and async paths share everything but the fetch.
+    def page_window(self, queryset, request, view=None):
+        """The sliced queryset for the requested page (one extra row), or None."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+        self._window = (offset, reverse, current_position)
+
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+        if current_position is not None:
+            order = self.ordering[0]
+            order_attr = order.lstrip('-')
+            lookup = 'lt' if self.cursor.reverse != order.startswith('-') else 'gt'
+            queryset = queryset.filter(**{f'{order_attr}__{lookup}': current_position})
+        return queryset[offset:offset + self.page_size + 1]
+
+    def set_page(self, results):
+        offset, reverse, current_position = self._window
+        self.page = list(results[:self.page_size])
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None or offset > 0
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def include_count(self, request):
+        if not getattr(settings, 'EMP_DET_PAGINATION_COUNT', True):
+            return False
+        value = request.query_params.get(self.count_query_param, 'true')
+        return value.lower() not in ('0', 'false', 'no', 'off')
+
+    def has_cursor(self, request):
+        return bool(request.query_params.get(self.cursor_query_param))
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.total_count is not None:
+            response[self.count_header] = self.total_count
+        return response
+
+
+class SearchPagination(LimitOffsetPagination):
+    """
+    Limit/offset pages of ranked search hits without a COUNT query: the
+    search fetches one row more than the limit to tell whether a next page
+    exists.
+    """
+    default_limit = 20
+    max_limit = 100
+
+    def paginate_hits(self, fetch, request):
+        """``fetch(limit, offset)`` returns up to ``limit + 1`` hits."""
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        hits = fetch(self.limit, self.offset)
+        self.has_next = len(hits) > self.limit
+        return hits[:self.limit]
+
+    def get_limit(self, request):
+        return int_query_param(request, self.limit_query_param, self.default_limit, cutoff=self.max_limit)
+
+    def get_offset(self, request):
+        return int_query_param(request, self.offset_query_param, 0, strict=False)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data})
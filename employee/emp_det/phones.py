@@ -0,0 +1,55 @@
+import re
+
+from .models import Employee, EmployeePhone
+
+# Lookups chunked below SQLite's bound-parameter limit.
+LOOKUP_CHUNK_SIZE = 500
+
+# EmployeePhone holds one row per number in Employee.phone, kept in sync by
+# the triggers of migration 0018_employee_phone, which store the numbers in
+# normalize_phone()'s form. Numbers of soft-deleted employees stay, lookups
+# join on is_deleted.
+
+# Dropped from a number before the country prefix is looked at. The
+# migration's trigger SQL strips the same characters and prefixes.
+PHONE_SEPARATORS = re.compile(r'[ ().+-]')
+PHONE_PREFIXES = ('0091', '91', '0')
+
+
+def normalize_phone(value):
+    """
+    The 10-digit national number in ``value`` ("+91 98765-43210",
+    "09876543210" and "9876543210" are all "9876543210"), or None when it
+    does not hold one.
+    """
+    digits = PHONE_SEPARATORS.sub('', value)
+    for prefix in PHONE_PREFIXES:
+        if len(digits) == 10 + len(prefix) and digits.startswith(prefix):
+            digits = digits[len(prefix):]
+            break
+    return digits if re.fullmatch(r'[0-9]{10}', digits) else None
+
+
+def phone_owners(numbers, exclude=None):
+    """
+    ``{number: [employee_id, ...]}`` for the numbers in ``numbers`` held by
+    live employees, optionally leaving out the employee ``exclude``. Keys are
+    normalized (see normalize_phone()); numbers that cannot be are skipped.
+    One seek on employee_phone_number_idx per number.
+    """
+    owners = {}
+    numbers = sorted({normalize_phone(number) for number in numbers} - {None})
+    for start in range(0, len(numbers), LOOKUP_CHUNK_SIZE):
+        chunk = numbers[start:start + LOOKUP_CHUNK_SIZE]
+        rows = EmployeePhone.objects.filter(number__in=chunk, employee__is_deleted=False)
+        if exclude is not None:
+            rows = rows.exclude(employee_id=exclude)
+        for number, employee_id in rows.order_by('number', 'employee_id').values_list('number', 'employee_id'):
+            owners.setdefault(number, []).append(employee_id)
+    return owners
+
+
+def employees_with_phone(number):
+    """Live employees listing the normalized ``number``, by id."""
+    return Employee.objects.filter(phone_numbers__number=number).order_by('id')
+
@@ -0,0 +1,141 @@
+import gzip
+import io
+import logging
+import os
+import time
+from pathlib import Path
+
+from django.core import serializers
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Address, Employee, Project
+from .versioning import coalesced_bumps
+
+logger = logging.getLogger(__name__)
+
+PURGE_ORDER = ('Employee', 'Project', 'Address')
+
+
+class Archive:
+    """
+    Append-only, gzip-compressed JSON Lines file in Django's ``jsonl``
+    serialization format, so ``manage.py loaddata <file>.jsonl.gz`` brings
+    rows back. Each batch is synced to disk before its rows are deleted;
+    reopening an existing file appends a new gzip member.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'ab')
+        self._gzip = gzip.GzipFile(fileobj=self._file, mode='ab')
+        self._text = io.TextIOWrapper(self._gzip, encoding='utf-8')
+
+    def write(self, queryset):
+        serializers.serialize('jsonl', queryset, stream=self._text)
+
+    def sync(self):
+        self._text.flush()
+        self._gzip.flush()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._text.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def expired(model, cutoff):
+    return model.objects.all_objects().filter(is_deleted=True, deleted_at__lt=cutoff).order_by('deleted_at', 'pk')
+
+
+def orphaned_addresses():
+    return Address.objects.filter(employee__isnull=True).order_by('pk')
+
+
+def _purge_employees(archive, cutoff, batch_size):
+    ids = list(expired(Employee, cutoff).values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return 0, {}
+    employees = Employee.objects.all_objects().filter(pk__in=ids)
+    # Hard-deleting an employee takes all of its projects with it, live ones
+    # included, so they are archived too.
+    projects = Project.objects.all_objects().filter(employee__in=ids)
+    address_ids = list(employees.values_list('address_id', flat=True))
+    archive.write(Address.objects.filter(pk__in=address_ids))
+    archive.write(employees)
+    archive.write(projects)
+    archive.sync()
+    removed = {
+        'Project': projects.hard_delete()[0],
+        'Employee': employees.hard_delete()[0],
+    }
+    removed['Address'] = Address.objects.filter(pk__in=address_ids, employee__isnull=True).delete()[0]
+    return len(ids), removed
+
+
+def _purge_projects(archive, cutoff, batch_size):
+    ids = list(expired(Project, cutoff).values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return 0, {}
+    projects = Project.objects.all_objects().filter(pk__in=ids)
+    archive.write(projects)
+    archive.sync()
+    return len(ids), {'Project': projects.hard_delete()[0]}
+
+
+def _purge_addresses(archive, cutoff, batch_size):
+    ids = list(orphaned_addresses().values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return 0, {}
+    addresses = Address.objects.filter(pk__in=ids, employee__isnull=True)
+    archive.write(addresses)
+    archive.sync()
+    return len(ids), {'Address': addresses.delete()[0]}
+
+
+def count_purgeable(cutoff):
+    return {
+        'Employee': expired(Employee, cutoff).count(),
+        'Project': expired(Project, cutoff).count(),
+        'Address': orphaned_addresses().count(),
+    }
+
+
+def purge_deleted(archive, cutoff, batch_size=500, pause=0.0, on_batch=None):
+    """
+    Archive and hard-delete soft-deleted employees and projects whose
+    deleted_at is before ``cutoff``, then orphaned addresses.
+
+    Every batch is archived and deleted in one short transaction, with a pause
+    between batches so other writers get the SQLite write lock. The selection
+    is recomputed per batch, so an interrupted run is resumed by running it
+    again. Returns the number of rows removed per model.
+    """
+    totals = dict.fromkeys(PURGE_ORDER, 0)
+    for step in (_purge_employees, _purge_projects, _purge_addresses):
+        while True:
+            with transaction.atomic(), coalesced_bumps():
+                selected, removed = step(archive, cutoff, batch_size)
+            for name, count in removed.items():
+                totals[name] += count
+            if removed:
+                logger.info("purged %s", removed)
+                if on_batch:
+                    on_batch(removed)
+            if selected < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+    return totals
+
+
+def default_archive_path(directory):
+    return Path(directory) / f"purge-{timezone.now():%Y%m%dT%H%M%S}.jsonl.gz"
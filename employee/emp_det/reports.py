@@ -0,0 +1,114 @@
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.db.models import FilteredRelation, Q
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+
+from .models import Employee
+
+REPORT_TITLE = "Employee Report"
+REPORT_HEADERS = ["Name", "Role", "Company", "Phone", "Active", "Project Title", "Project Status"]
+REPORT_SHEET_PATH = 'xl/worksheets/sheet1.xml'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def iter_report_rows(chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield one report row per (employee, project) pair, or one per employee
+    without projects, from a single LEFT JOIN read in server-side chunks.
+    Soft-deleted employees and projects are left out.
+    """
+    rows = (
+        Employee.objects
+        .annotate(live_projects=FilteredRelation('projects', condition=Q(projects__is_deleted=False)))
+        .order_by('id', 'live_projects__id')
+        .values_list('name', 'role', 'company', 'phone', 'active', 'live_projects__title', 'live_projects__status')
+        .iterator(chunk_size=chunk_size)
+    )
+    for name, role, company, phone, active, title, project_status in rows:
+        phones = ", ".join(phone) if isinstance(phone, list) else ""
+        yield [name, role, company, phones, active, title, project_status]
+
+
+def build_report_workbook(rows):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(REPORT_TITLE)
+    ws.append(REPORT_HEADERS)
+    for row in rows:
+        ws.append(row)
+    return wb
+
+
+def _cell_xml(ref, value):
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}" t="n"><v>{value}</v></c>'
+    text = escape(ILLEGAL_CHARACTERS_RE.sub('', str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t>{text}</t></is></c>'
+
+
+def _row_xml(index, row):
+    cells = ''.join(
+        _cell_xml(f'{get_column_letter(column)}{index}', value)
+        for column, value in enumerate(row, start=1)
+        if value not in (None, '')
+    )
+    return f'<row r="{index}">{cells}</row>'
+
+
+class _ChunkSink:
+    """Unseekable file object that hands written bytes back to the generator."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_report_xlsx(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Generate the report as XLSX bytes while rows are still being read.
+
+    openpyxl's write-only workbook produces the package (styles, workbook,
+    header row); the sheet's rows are then spliced into a streamed zip entry
+    so nothing but the current chunk is held in memory.
+    """
+    skeleton = io.BytesIO()
+    build_report_workbook([]).save(skeleton)
+
+    sink = _ChunkSink()
+    with zipfile.ZipFile(skeleton) as source, zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for info in source.infolist():
+            if info.filename != REPORT_SHEET_PATH:
+                archive.writestr(info.filename, source.read(info.filename))
+        sheet_head, sheet_tail = source.read(REPORT_SHEET_PATH).decode('utf-8').split('</sheetData>')
+
+        with archive.open(REPORT_SHEET_PATH, 'w', force_zip64=True) as sheet:
+            sheet.write(sheet_head.encode('utf-8'))
+            batch = []
+            for index, row in enumerate(rows, start=2):
+                batch.append(_row_xml(index, row))
+                if len(batch) >= chunk_size:
+                    sheet.write(''.join(batch).encode('utf-8'))
+                    batch = []
+                    data = sink.drain()
+                    if data:
+                        yield data
+            sheet.write(''.join(batch).encode('utf-8'))
+            sheet.write(('</sheetData>' + sheet_tail).encode('utf-8'))
+    yield sink.drain()
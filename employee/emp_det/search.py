@@ -0,0 +1,119 @@
+import html
+import logging
+import re
+
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+EMPLOYEE_INDEX = 'emp_det_employee_search'
+PROJECT_INDEX = 'emp_det_project_search'
+
+# FTS5 tables keyed on the row id. Migration 0019_search_index creates them
+# and the triggers that keep them in sync with the live rows; SQLite drops a
+# table's triggers when a migration rebuilds it, so such migrations must
+# recreate them. The employee document includes its address' hometown and
+# state.
+EMPLOYEE_ROWS = (
+    f"INSERT INTO {EMPLOYEE_INDEX}(rowid, name, role, company, hometown, state) "
+    "SELECT e.id, e.name, e.role, e.company, a.hometown, a.state FROM emp_det_employee e "
+    "LEFT JOIN emp_det_address a ON a.id = e.address_id WHERE e.is_deleted = 0"
+)
+PROJECT_ROWS = (
+    f"INSERT INTO {PROJECT_INDEX}(rowid, title, description) "
+    "SELECT p.id, p.title, p.description FROM emp_det_project p WHERE p.is_deleted = 0"
+)
+
+# BM25 column weights: a hit in the name or title outranks one in the text.
+EMPLOYEE_WEIGHTS = (10.0, 2.0, 2.0, 1.0, 1.0)
+PROJECT_WEIGHTS = (5.0, 1.0)
+
+# snippet() marks matches with the STX/ETX control characters rather than
+# <em> tags, so the indexed text can be HTML-escaped before the markers are
+# turned into tags (see highlight()).
+SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS = '\x02', '\x03', '…', 12
+
+
+def highlight(snippet):
+    """The snippet as HTML: indexed text escaped, matches in <em>."""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(SNIPPET_START, '<em>').replace(SNIPPET_END, '</em>')
+
+SEARCH_TYPES = {
+    'employee': (
+        f"SELECT 'employee', rowid, name, "
+        f"snippet({EMPLOYEE_INDEX}, -1, %s, %s, %s, {SNIPPET_TOKENS}), "
+        f"bm25({EMPLOYEE_INDEX}, {', '.join(map(str, EMPLOYEE_WEIGHTS))}) "
+        f"FROM {EMPLOYEE_INDEX} WHERE {EMPLOYEE_INDEX} MATCH %s"
+    ),
+    'project': (
+        f"SELECT 'project', rowid, title, "
+        f"snippet({PROJECT_INDEX}, -1, %s, %s, %s, {SNIPPET_TOKENS}), "
+        f"bm25({PROJECT_INDEX}, {', '.join(map(str, PROJECT_WEIGHTS))}) "
+        f"FROM {PROJECT_INDEX} WHERE {PROJECT_INDEX} MATCH %s"
+    ),
+}
+
+
+def match_expression(text):
+    """
+    An FTS5 query matching rows that contain every word of ``text`` as a word
+    prefix ("jo dev" finds "John", "Developer"). Quoting each word keeps FTS5
+    operators and punctuation in user input from being parsed.
+    """
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(text, types=tuple(SEARCH_TYPES), limit=20, offset=0, using='default'):
+    """
+    Best matches first, as dicts with type, id, label, snippet and score (BM25,
+    lower is better). Returns ``limit + 1`` rows at most, so callers can tell
+    whether there is a next page.
+    """
+    expression = match_expression(text)
+    if not expression:
+        return []
+    parts, params = [], []
+    for name in types:
+        parts.append(SEARCH_TYPES[name])
+        params.extend([SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, expression])
+    sql = f"{' UNION ALL '.join(parts)} ORDER BY 5, 1, 2 LIMIT %s OFFSET %s"
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params + [limit + 1, offset])
+        rows = cursor.fetchall()
+    return [
+        {'type': kind, 'id': pk, 'label': label, 'snippet': highlight(snippet), 'score': round(score, 4)}
+        for kind, pk, label, snippet, score in rows
+    ]
+
+
+def is_installed(using='default'):
+    """Whether the search tables exist (emp_det is migrated on SQLite)."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN (%s, %s)",
+            [EMPLOYEE_INDEX, PROJECT_INDEX],
+        )
+        return cursor.fetchone()[0] == 2
+
+
+def rebuild(using='default'):
+    """
+    Refill the index from the live rows, e.g. after writes made while the
+    triggers were missing. Returns ``{table: row count}``.
+    """
+    counts = {}
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        for table, rows in ((EMPLOYEE_INDEX, EMPLOYEE_ROWS), (PROJECT_INDEX, PROJECT_ROWS)):
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(rows)
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table] = cursor.fetchone()[0]
+    logger.info("search index rebuilt: %s", counts)
+    return counts
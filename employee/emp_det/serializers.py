@@ -1,5 +1,10 @@
 from rest_framework import serializers
-from .models import Employee, Project, Address
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from .fieldsets import SparseFieldsetSerializerMixin
+from .models import Employee, Project, Address, ReportJob
+from .phones import phone_owners
 import re
 import logging
 
@@ -10,7 +15,7 @@ logger = logging.getLogger(__name__)
 class AddressSerializer(serializers.ModelSerializer):
     class Meta:
         model = Address
-        fields = '__all__'
+        exclude = ['version', 'updated_at']
     
     def validate_pincode(self, value):
         if not re.match(r'^\d{6}$', value):
@@ -23,22 +28,56 @@ class AddressSerializer(serializers.ModelSerializer):
         return value
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+NAME_TAKEN_MESSAGE = "A user with this name already exists."
+TITLE_TAKEN_MESSAGE = "A project with this title already exists."
+PHONE_TAKEN_MESSAGE = "Phone number {number} already belongs to another employee."
+
+
+def validate_name_format(value):
+    if not re.match(r'^[a-zA-Z\s]+$', value):
+        raise serializers.ValidationError("Name should only contain letters and spaces.")
+
+
+# What SQLite's "UNIQUE constraint failed: ..." message names for each
+# field's case-insensitive unique index.
+UNIQUE_CONSTRAINTS = {
+    'name': {"index 'employee_name_ci_unique'"},
+    'title': {"index 'project_title_ci_unique'"},
+}
+
+
+def violated_unique_constraints(exc):
+    match = re.match(r'UNIQUE constraint failed: (.+)$', str(exc))
+    return set(match.group(1).split(', ')) if match else set()
+
+
+def save_unique(field, message, save):
+    """
+    Run ``save`` in a savepoint and report a unique-constraint violation on
+    ``field`` as a validation error, so uniqueness is enforced by the
+    case-insensitive database constraint rather than a lookup before insert.
+    Any other IntegrityError is re-raised.
+    """
+    try:
+        with transaction.atomic():
+            return save()
+    except IntegrityError as exc:
+        if not violated_unique_constraints(exc) & UNIQUE_CONSTRAINTS[field]:
+            raise
+        raise serializers.ValidationError({field: [message]})
+
+
+class EmployeeSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     
     address = AddressSerializer(required=True)
     
     class Meta:
         model = Employee
-        fields = '__all__'
+        exclude = ['version', 'updated_at', 'deleted_at']
 
     def validate_name(self, value):
         logger.info("NAME: %s", value)
-        if not re.match(r'^[a-zA-Z\s]+$', value):
-            raise serializers.ValidationError("Name should only contain letters and spaces.")
-        
-        name_lower = value.lower()
-        if Employee.objects.filter(name__iexact=name_lower).exists():
-            raise serializers.ValidationError("A user with this name already exists.")
+        validate_name_format(value)
         return value
     
     def validate_phone(self, value):
@@ -52,7 +91,14 @@ class EmployeeSerializer(serializers.ModelSerializer):
         
         if errors:
             raise serializers.ValidationError(errors)
-        
+
+        # An indexed lookup on the phone table; bulk create checks the whole
+        # batch at once instead.
+        if self.context.get('check_phone_owners', True):
+            owners = phone_owners(value, exclude=self.instance.pk if self.instance else None)
+            if owners:
+                raise serializers.ValidationError([PHONE_TAKEN_MESSAGE.format(number=number) for number in owners])
+
         return value
 
     def validate_company(self, value):
@@ -66,7 +112,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return value
     
     def validate(self, value):
-        expected_fields = [field.name for field in self.Meta.model._meta.fields]
+        expected_fields = [field.name for field in self.Meta.model._meta.fields if field.name in self.fields]
         expected_fields = set(expected_fields) - {'id'}
 
         provided_fields = set(self.initial_data.keys())
@@ -83,18 +129,25 @@ class EmployeeSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         address_data = validated_data.pop('address')
-        address = Address.objects.create(**address_data)
-        employee = Employee.objects.create(address=address, **validated_data)
-        return employee
+
+        def save():
+            address = Address.objects.create(**address_data)
+            return Employee.objects.create(address=address, **validated_data)
+
+        return save_unique('name', NAME_TAKEN_MESSAGE, save)
 
     def update(self, instance, validated_data):
         address_data = validated_data.pop('address', None)
-        if address_data:
-            Address.objects.update_or_create(
-                defaults=address_data,
-                pk=instance.address.pk
-            )
-        return super().update(instance, validated_data)
+
+        def save():
+            if address_data:
+                Address.objects.update_or_create(
+                    defaults=address_data,
+                    pk=instance.address.pk
+                )
+            return super(EmployeeSerializer, self).update(instance, validated_data)
+
+        return save_unique('name', NAME_TAKEN_MESSAGE, save)
 
 
 # GET Serializers - (AddressGetSerializer and EmployeeGetSerializer)
@@ -112,7 +165,7 @@ class AddressGetSerializer(serializers.ModelSerializer):
         return representation
 
 
-class EmployeeGetSerializer(serializers.ModelSerializer):
+class EmployeeGetSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     address = AddressGetSerializer(required=True)
     project_count = serializers.SerializerMethodField()
     ongoing_project_count = serializers.SerializerMethodField()
@@ -124,13 +177,21 @@ class EmployeeGetSerializer(serializers.ModelSerializer):
         # fields = ['address']
         fields = ['name','address','role','phone','company','project_count','ongoing_project_count','completed_project_count']
     
+    # Prefer the annotations from SoftDeleteQuerySet.with_project_counts()
+    # and only fall back to a COUNT query for un-annotated instances.
     def get_project_count(self, obj):
+        if hasattr(obj, 'project_total'):
+            return obj.project_total
         return obj.projects.count()
 
     def get_ongoing_project_count(self, obj):
+        if hasattr(obj, 'project_ongoing'):
+            return obj.project_ongoing
         return obj.projects.filter(status='Ongoing').count()
 
     def get_completed_project_count(self, obj):
+        if hasattr(obj, 'project_done'):
+            return obj.project_done
         return obj.projects.filter(status='Done').count()
 
     def to_representation(self, instance):
@@ -140,33 +201,40 @@ class EmployeeGetSerializer(serializers.ModelSerializer):
         return representation
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+def validate_title_format(value):
+    if not re.match(r'^[a-zA-Z\s\d]+$', value):
+        raise serializers.ValidationError("Title should only contain letters, digits and spaces.")
+
+
+class ProjectSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    duration = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = Project
-        fields = '__all__'
+        exclude = ['version', 'updated_at', 'deleted_at']
 
     def validate_title(self, value):
-        if not re.match(r'^[a-zA-Z\s\d]+$', value):
-            raise serializers.ValidationError("Title should only contain letters, digits and spaces.")
-        
-        title_lower = value.lower()
-        if Project.objects.filter(title__iexact=title_lower).exists():
-            raise serializers.ValidationError("A project with this title already exists.")
+        validate_title_format(value)
         return value
 
+    def create(self, validated_data):
+        return save_unique('title', TITLE_TAKEN_MESSAGE, lambda: super(ProjectSerializer, self).create(validated_data))
+
+    def update(self, instance, validated_data):
+        return save_unique(
+            'title', TITLE_TAKEN_MESSAGE, lambda: super(ProjectSerializer, self).update(instance, validated_data)
+        )
+
     def validate(self, data):
-        if 'start_date' in data and 'end_date' in data:
-            start_date = data['start_date']
-            end_date = data['end_date']
-            
-            duration = (end_date - start_date).days
-            if duration < 0:
-                raise serializers.ValidationError("End date must be after the start date.")
-            
-            data['duration'] = duration
+        # Partial updates are checked against the stored dates, ahead of the
+        # project_end_after_start constraint.
+        start_date = data.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = data.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError("End date must be after the start date.")
         return data
 
-class ProjectGetSerializer(serializers.ModelSerializer):
+class ProjectGetSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
         # fields = []
@@ -177,3 +245,65 @@ class ProjectGetSerializer(serializers.ModelSerializer):
         if all(value in [None, '', []] for value in representation.values()):
             return {"message": "empty"}
         return representation
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ['id', 'status', 'data_version', 'error', 'created_at', 'finished_at', 'download_url']
+
+    def get_download_url(self, obj):
+        if obj.status != 'Done':
+            return None
+        return reverse('employee-report-job-download', kwargs={'pk': obj.pk})
+
+
+class BulkFilterSerializer(serializers.Serializer):
+    """Equality filters for a bulk selection; unknown fields are an error."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            unknown = sorted(set(data) - set(self.fields))
+            if unknown:
+                raise serializers.ValidationError(f"Unsupported filter field(s): {', '.join(unknown)}.")
+        return super().to_internal_value(data)
+
+
+class EmployeeBulkFilterSerializer(BulkFilterSerializer):
+    company = serializers.CharField(required=False)
+    role = serializers.CharField(required=False)
+    active = serializers.BooleanField(required=False)
+
+
+class ProjectBulkFilterSerializer(BulkFilterSerializer):
+    status = serializers.ChoiceField(choices=Project.STATUS_CHOICES, required=False)
+    employee = serializers.IntegerField(required=False)
+    end_date__lt = serializers.DateTimeField(required=False)
+
+
+class BulkSelectionSerializer(serializers.Serializer):
+    """``{"ids": [...]}`` or ``{"filter": {...}}``, the rows a bulk soft delete or restore applies to."""
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, required=False)
+
+    def validate_ids(self, value):
+        max_ids = getattr(settings, 'EMP_DET_BULK_MAX_RECORDS', 10000)
+        if len(value) > max_ids:
+            raise serializers.ValidationError(f"At most {max_ids} ids per request.")
+        return value
+
+    def validate(self, data):
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError("Pass either ids or filter.")
+        if 'filter' in data and not data['filter']:
+            raise serializers.ValidationError({'filter': ["Name at least one field."]})
+        return data
+
+
+class EmployeeBulkSelectionSerializer(BulkSelectionSerializer):
+    filter = EmployeeBulkFilterSerializer(required=False)
+
+
+class ProjectBulkSelectionSerializer(BulkSelectionSerializer):
+    filter = ProjectBulkFilterSerializer(required=False)
@@ -0,0 +1,59 @@
+import logging
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .credentials import credential_cache
+from .instrumentation import dispatch_queries
+from .models import Address, Employee, Project
+from .versioning import bump_version
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Address)
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Project)
+def bump_data_version(sender, **kwargs):
+    bump_version(sender)
+
+
+# A password or is_active change must not be served from the credential cache.
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_credentials(sender, instance, **kwargs):
+    credential_cache.invalidate_user(instance.pk)
+
+
+# Lets the request middleware observe every query of a request, whichever
+# thread and connection runs it.
+@receiver(connection_created)
+def install_query_dispatcher(sender, connection, **kwargs):
+    if dispatch_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(dispatch_queries)
+
+
+# Per-connection SQLite settings from the database's PRAGMAS entry (see the
+# profiles in settings.py). journal_mode=WAL persists in the file; the rest
+# only last as long as the connection, hence the hook.
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('PRAGMAS') or {}
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+            if name == 'journal_mode':
+                mode = cursor.fetchone()[0]
+                if mode.lower() != str(value).lower():
+                    # In-memory test databases cannot use WAL.
+                    logger.debug("sqlite journal_mode is %s, not %s", mode, value)
+
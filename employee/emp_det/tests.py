@@ -1,3 +1,1231 @@
-from django.test import TestCase
+import base64
+import gzip
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from datetime import timedelta
+from types import ModuleType
+from unittest import mock
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.utils import ConnectionHandler
+from django.db.models import F
+from django.test import AsyncClient, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from .authentication import CustomAuthentication
+from .benchmarks import SCENARIOS, compare, run_suite
+from .bulk import import_projects
+from .caching import get_response_cache, response_cache_stats
+from .credentials import credential_cache
+from .metrics import registry as metrics_registry
+from .pagination import KeysetPagination
+from .middleware import AuthenticationMiddleware
+from . import phones
+from .models import Address, Employee, EmployeePhone, Project, ReportJob, VersionConflict
+from .purge import expired
+from .serializers import NAME_TAKEN_MESSAGE, TITLE_TAKEN_MESSAGE, save_unique
+from .urls import build_urlpatterns
+from .versioning import bump_version
+from .views import ProjectRetrieveUpdateDestroyAPIView
+
+
+def make_employee(name, **kwargs):
+    address = Address.objects.create(add_line='1 Main Road', state='Kerala', hometown='Kochi', pincode='682001')
+    return Employee.objects.create(name=name, address=address, **kwargs)
+
+
+def make_project(employee, title, status='Ongoing', **kwargs):
+    start = kwargs.pop('start_date', timezone.now())
+    end = kwargs.pop('end_date', start + timedelta(days=10))
+    kwargs.setdefault('description', '')
+    return Project.objects.create(
+        title=title, start_date=start, end_date=end,
+        employee=employee, status=status, **kwargs
+    )
+
+
+class QueryPlanAssertionsMixin:
+    """Assertions over SQLite's EXPLAIN QUERY PLAN for a queryset."""
+
+    def query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[3] for row in cursor.fetchall()]
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.query_plan(queryset)
+        table = queryset.model._meta.db_table
+        table_steps = [step for step in plan if f' {table} ' in f'{step} ']
+        self.assertTrue(
+            any(f'INDEX {index_name}' in step for step in table_steps),
+            f'{index_name} not used for {table}: {plan}',
+        )
+        full_scans = [step for step in table_steps if step.startswith('SCAN') and 'INDEX' not in step]
+        self.assertFalse(full_scans, f'Full table scan of {table}: {plan}')
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        employee = make_employee('Page Owner')
+        start = timezone.now()
+        # Five projects share a start date, so the cursor has to carry an
+        # offset past the ties.
+        for n in range(7):
+            make_project(employee, f'Paged {n}', start_date=start + timedelta(days=0 if n < 5 else n))
+
+    def titles(self, response):
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['title'] for row in response.data['results']]
+
+    def test_next_and_previous_across_tied_positions(self):
+        response = self.client.get('/api/projects/', {'ordering': 'start_date', 'page_size': 2})
+        self.assertIsNone(response.data['previous'])
+        pages = [self.titles(response)]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            pages.append(self.titles(response))
+        self.assertEqual(pages, [['Paged 0', 'Paged 1'], ['Paged 2', 'Paged 3'], ['Paged 4', 'Paged 5'], ['Paged 6']])
+
+        backwards = []
+        while response.data['previous']:
+            response = self.client.get(response.data['previous'])
+            backwards.append(self.titles(response))
+        self.assertEqual(backwards, pages[-2::-1])
+
+    def test_page_size_is_capped_and_validated(self):
+        paginator = KeysetPagination()
+        factory = RequestFactory()
+        self.assertEqual(paginator.get_page_size(Request(factory.get('/', {'page_size': '5000'}))), 1000)
+        self.assertEqual(paginator.get_page_size(Request(factory.get('/'))), 50)
+        self.assertEqual(len(self.titles(self.client.get('/api/projects/', {'page_size': 3}))), 3)
+        for value in ('abc', '0', '-5'):
+            with self.subTest(page_size=value):
+                response = self.client.get('/api/projects/', {'page_size': value})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('page_size', response.data)
+
+    def test_total_count_can_be_switched_off(self):
+        self.assertEqual(self.client.get('/api/projects/')['X-Total-Count'], '7')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/projects/', {'count': 'false'})
+        self.assertNotIn('X-Total-Count', response)
+        self.assertFalse([query for query in queries.captured_queries if 'COUNT(' in query['sql']])
+        with override_settings(EMP_DET_PAGINATION_COUNT=False):
+            self.assertNotIn('X-Total-Count', self.client.get('/api/projects/', {'page_size': 5}))
+
+
+class EmployeeProjectCountTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+
+    def seed(self, count, offset=0):
+        for i in range(offset, offset + count):
+            employee = make_employee(f'Employee {chr(65 + i % 26)}{i}')
+            make_project(employee, f'Ongoing {i}')
+            make_project(employee, f'Done {i}', status='Done')
+            make_project(employee, f'Deleted {i}', is_deleted=True)
+
+    def test_with_project_counts_excludes_soft_deleted_projects(self):
+        self.seed(1)
+        employee = Employee.objects.with_project_counts().get()
+        self.assertEqual(
+            (employee.project_total, employee.project_ongoing, employee.project_done),
+            (2, 1, 1),
+        )
+
+    def test_list_query_count_is_constant(self):
+        self.seed(3)
+        # The data-version lookup, one COUNT for X-Total-Count and one page
+        # query with the aggregates.
+        with self.assertNumQueries(3):
+            small = self.client.get('/api/employees/')
+        self.seed(20, offset=3)
+        with self.assertNumQueries(3):
+            large = self.client.get('/api/employees/')
+
+        self.assertEqual(len(small.data['results']), 3)
+        self.assertEqual(len(large.data['results']), 23)
+        first = large.data['results'][0]
+        self.assertEqual(
+            (first['project_count'], first['ongoing_project_count'], first['completed_project_count']),
+            (2, 1, 1),
+        )
+        self.assertEqual(first['address']['hometown'], 'Kochi')
+
+
+def sheet_rows(body):
+    return list(load_workbook(io.BytesIO(body))['Employee Report'].iter_rows(values_only=True))
+
+
+@override_settings(EMP_DET_REPORT_JOBS_EAGER=True)
+class EmployeeReportTests(TestCase):
+    def setUp(self):
+        report_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(report_dir.cleanup)
+        settings_override = override_settings(EMP_DET_REPORT_DIR=report_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_streamed_report_matches_buffered_report(self):
+        employee = make_employee('Report Employee', role='Dev')
+        make_project(employee, 'Report Project')
+        make_project(employee, 'Hidden Project', is_deleted=True)
+        make_employee('Idle Employee')
+
+        client = APIClient()
+        # The data-version lookup plus the single report query.
+        with self.assertNumQueries(2):
+            streamed = client.get('/api/employees/reports/')
+            streamed_body = b''.join(streamed.streaming_content)
+        buffered = client.get('/api/employees/reports/?stream=false')
+
+        rows = sheet_rows(streamed_body)
+        self.assertEqual(rows, sheet_rows(buffered.content))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][0], 'Report Employee')
+        self.assertEqual(rows[1][5:], ('Report Project', 'Ongoing'))
+        self.assertEqual(rows[2][5:], (None, None))
+
+    def test_report_job_reuses_artifact_until_data_changes(self):
+        employee = make_employee('Job Employee')
+        client = APIClient()
+
+        created = client.post('/api/employees/reports/jobs/')
+        self.assertEqual(created.status_code, 202)
+        self.assertEqual(created.data['status'], 'Done')
+
+        polled = client.get(f"/api/employees/reports/jobs/{created.data['id']}/")
+        self.assertEqual(polled.data['download_url'], created.data['download_url'])
+        download = client.get(created.data['download_url'])
+        self.assertEqual(sheet_rows(b''.join(download.streaming_content))[1][0], 'Job Employee')
+
+        reused = client.post('/api/employees/reports/jobs/')
+        self.assertEqual((reused.status_code, reused.data['id']), (200, created.data['id']))
+
+        Employee.objects.filter(pk=employee.pk).delete()
+        rebuilt = client.post('/api/employees/reports/jobs/')
+        self.assertEqual(rebuilt.status_code, 202)
+        self.assertNotEqual(rebuilt.data['data_version'], created.data['data_version'])
+        self.assertEqual(ReportJob.objects.count(), 2)
+
+    def test_finished_jobs_prune_superseded_artifacts(self):
+        employee = make_employee('Prune Employee')
+        client = APIClient()
+        old = client.post('/api/employees/reports/jobs/').data
+        old_path = Path(ReportJob.objects.get(pk=old['id']).file_path)
+
+        # A newer data version within the retention period keeps the file.
+        Employee.objects.filter(pk=employee.pk).update(role='Dev')
+        bump_version(Employee)
+        client.post('/api/employees/reports/jobs/')
+        self.assertTrue(old_path.exists())
+
+        # Past it, the next finished job removes the file; the old job then
+        # reports 410 until it is itself past the job retention.
+        os.utime(old_path, (0, 0))
+        Employee.objects.filter(pk=employee.pk).update(role='Lead')
+        bump_version(Employee)
+        newest = client.post('/api/employees/reports/jobs/').data
+        self.assertFalse(old_path.exists())
+        self.assertTrue(Path(ReportJob.objects.get(pk=newest['id']).file_path).exists())
+        self.assertEqual(client.get(old['download_url']).status_code, 410)
+
+        ReportJob.objects.exclude(pk=newest['id']).update(created_at=timezone.now() - timedelta(days=8))
+        out = io.StringIO()
+        call_command('prune_reports', stdout=out)
+        self.assertIn('Removed 0 report files and 2 report jobs', out.getvalue())
+        self.assertEqual(client.get(old['download_url']).status_code, 404)
+        self.assertEqual(list(ReportJob.objects.values_list('pk', flat=True)), [UUID(newest['id'])])
+
+
+class ExportTests(TestCase):
+    def test_employee_csv_selects_columns_and_filters(self):
+        make_employee('Export Active', phone=['9876543210'])
+        make_employee('Export Inactive', active=False)
+        deleted = make_employee('Export Deleted')
+        Employee.objects.filter(pk=deleted.pk).delete()
+
+        response = APIClient().get('/api/employees/export/csv/?columns=name,phone,address_state&active=true')
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body.splitlines(), ['name,phone,address_state', 'Export Active,9876543210,Kerala'])
+
+    def test_project_ndjson_includes_deleted_on_request(self):
+        employee = make_employee('Export Owner')
+        make_project(employee, 'Live Project')
+        make_project(employee, 'Gone Project', is_deleted=True)
+
+        response = APIClient().get('/api/projects/export/ndjson/?columns=title,employee_name&deleted=include')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines, [
+            '{"title":"Live Project","employee_name":"Export Owner"}',
+            '{"title":"Gone Project","employee_name":"Export Owner"}',
+        ])
+
+
+class EmployeeBulkCreateTests(TestCase):
+    def payload(self, name, **overrides):
+        record = {
+            'name': name, 'phone': ['9876543210'], 'company': 'Acme', 'role': 'Dev', 'active': True,
+            'is_deleted': False,
+            'address': {'add_line': '1 Main Road', 'state': 'Kerala', 'hometown': 'Kochi', 'pincode': '682001'},
+        }
+        record.update(overrides)
+        return record
+
+    def test_bulk_create_reports_results_by_index(self):
+        make_employee('Existing Person', phone=['9000000000'])
+        records = [
+            self.payload('Bulk One'),
+            self.payload('existing person'),
+            self.payload('Bulk Two', phone=['123']),
+            self.payload('bulk one'),
+            self.payload('Bulk Three', phone=['9876543211']),
+            self.payload('Bulk Four'),
+            self.payload('Bulk Five', phone=['9000000000']),
+        ]
+
+        # One name and one phone lookup, then a savepoint around two INSERTs
+        # and two data-version bumps; nothing scales with the number of records.
+        with self.assertNumQueries(8):
+            response = APIClient().post('/api/employees/bulk/?batch_size=2', records, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 5))
+        statuses = [result['status'] for result in response.data['results']]
+        self.assertEqual(statuses, ['created', 'error', 'error', 'error', 'created', 'error', 'error'])
+        self.assertIn('phone', response.data['results'][2]['errors'])
+        self.assertEqual(response.data['results'][5]['errors'],
+                         {'phone': ['Phone number 9876543210 already belongs to another employee.']})
+        self.assertIn('phone', response.data['results'][6]['errors'])
+        created = Employee.objects.get(pk=response.data['results'][4]['id'])
+        self.assertEqual((created.name, created.address.hometown), ('Bulk Three', 'Kochi'))
+
+
+class ProjectImportTests(TestCase):
+    def write_csv(self, text):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'projects.csv'
+        path.write_text(text)
+        return str(path)
+
+    def test_import_validates_and_bulk_inserts(self):
+        employee = make_employee('Import Owner')
+        make_project(employee, 'Taken Title')
+        path = self.write_csv(
+            "title,description,start_date,end_date,status,employee\n"
+            "Alpha,First,2024-01-01,2024-01-11,Ongoing,Import Owner\n"
+            f"Beta,,2024-02-01,2024-02-03,Done,{employee.pk}\n"
+            "taken title,,2024-01-01,2024-01-02,,Import Owner\n"
+            "Gamma,,2024-01-05,2024-01-01,,Import Owner\n"
+            "Delta,,2024-01-01,2024-01-02,,Nobody\n"
+        )
+        out, err = io.StringIO(), io.StringIO()
+
+        call_command('import_projects', path, '--dry-run', stdout=out, stderr=err)
+        self.assertIn('5 rows read, 2 projects would be created, 3 rejected', out.getvalue())
+        self.assertEqual(Project.objects.count(), 1)
+
+        call_command('import_projects', path, stdout=io.StringIO(), stderr=io.StringIO())
+        alpha = Project.objects.get(title='Alpha')
+        self.assertEqual((alpha.duration, alpha.employee_id), (10, employee.pk))
+        self.assertEqual(Project.objects.get(title='Beta').status, 'Done')
+        self.assertIn('line 4: title', err.getvalue())
+        self.assertIn('line 5: end_date', err.getvalue())
+        self.assertIn('line 6: employee', err.getvalue())
+
+    def test_overlong_title_and_description_are_rejected(self):
+        employee = make_employee('Import Owner')
+        row = {'start_date': '2024-01-01', 'end_date': '2024-01-02', 'employee': str(employee.pk)}
+        errors = {}
+        summary = import_projects(
+            [(2, {**row, 'title': 'A' * 241}), (3, {**row, 'title': 'Short', 'description': 'x' * 241}),
+             (4, {**row, 'title': 'Fits', 'description': 'x' * 240})],
+            on_error=errors.__setitem__,
+        )
+        self.assertEqual(summary['created'], 1)
+        self.assertEqual(errors, {
+            2: {'title': ['Ensure this field has no more than 240 characters.']},
+            3: {'description': ['Ensure this field has no more than 240 characters.']},
+        })
+
+    def test_titles_taken_after_the_lookup_are_reported(self):
+        employee = make_employee('Import Owner')
+        make_project(employee, 'Raced')
+        rows = [
+            (line, {'title': title, 'start_date': '2024-01-01', 'end_date': '2024-01-02', 'employee': str(employee.pk)})
+            for line, title in enumerate(['Before', 'RACED', 'After'], start=2)
+        ]
+        errors = {}
+        # As if another writer inserted "Raced" between the lookup and the INSERT.
+        with mock.patch('emp_det.bulk.existing_project_titles', return_value=set()):
+            summary = import_projects(rows, on_error=errors.__setitem__)
+        self.assertEqual((summary['created'], summary['failed']), (2, 1))
+        self.assertEqual(errors, {3: {'title': [TITLE_TAKEN_MESSAGE]}})
+        self.assertEqual(sorted(Project.objects.values_list('title', flat=True)), ['After', 'Before', 'Raced'])
+
+    def test_duplicates_across_batches_are_rejected(self):
+        employee = make_employee('Import Owner')
+        rows = [
+            (line, {'title': title, 'start_date': '2024-01-01', 'end_date': '2024-01-02', 'employee': str(employee.pk)})
+            for line, title in enumerate(['Alpha', 'Beta', 'ALPHA', 'beta'], start=2)
+        ]
+        for dry_run in (True, False):
+            with self.subTest(dry_run=dry_run):
+                errors = []
+                summary = import_projects(rows, batch_size=1, dry_run=dry_run, on_error=lambda line, e: errors.append(line))
+                self.assertEqual((summary['created'], errors), (2, [4, 5]))
+        self.assertEqual(sorted(Project.objects.values_list('title', flat=True)), ['Alpha', 'Beta'])
+
+
+class CredentialCacheTests(TestCase):
+    def setUp(self):
+        credential_cache.clear()
+        self.addCleanup(credential_cache.clear)
+        self.user = User.objects.create_user('alice', password='s3cret-pass')
+        self.factory = RequestFactory()
+
+    def basic_request(self, password='s3cret-pass'):
+        token = base64.b64encode(f'alice:{password}'.encode()).decode()
+        return self.factory.get('/api/employees/', HTTP_AUTHORIZATION=f'Basic {token}')
+
+    def authenticate(self, request):
+        middleware = AuthenticationMiddleware(lambda req: CustomAuthentication().authenticate(Request(req)))
+        return middleware(request)
+
+    def test_middleware_and_authentication_share_one_verification(self):
+        before = credential_cache.stats()
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(self.basic_request())
+        with self.assertNumQueries(0):
+            self.authenticate(self.basic_request())
+
+        after = credential_cache.stats()
+        self.assertEqual(user, self.user)
+        self.assertEqual((after['misses'] - before['misses'], after['hits'] - before['hits']), (1, 1))
+
+    def test_password_change_invalidates_cached_credentials(self):
+        self.authenticate(self.basic_request())
+        self.user.set_password('new-pass-123')
+        self.user.save()
+
+        self.assertEqual(self.authenticate(self.basic_request()).status_code, 401)
+        self.assertEqual(self.authenticate(self.basic_request('new-pass-123'))[0], self.user)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.authenticate(self.basic_request('new-pass-123')).status_code, 401)
+
+    def test_stamp_change_from_another_worker_invalidates(self):
+        self.authenticate(self.basic_request())
+        # What invalidate_user() in another process leaves in the shared cache.
+        credential_cache.stamp_cache().set(credential_cache.stamp_key(self.user.pk), 'changed elsewhere')
+        with self.assertNumQueries(1):
+            self.authenticate(self.basic_request())
+        with self.assertNumQueries(0):
+            self.authenticate(self.basic_request())
+
+    def test_requests_get_their_own_user_instance(self):
+        first, _ = self.authenticate(self.basic_request())
+        first.first_name = 'Mallory'
+        second, _ = self.authenticate(self.basic_request())
+        third, _ = self.authenticate(self.basic_request())
+        self.assertEqual((second.pk, second.first_name), (self.user.pk, ''))
+        self.assertIsNot(second, third)
+
+
+class CaseInsensitiveUniquenessTests(TestCase):
+    def test_duplicate_name_is_rejected_by_constraint(self):
+        make_employee('Jane Doe')
+        payload = {
+            'name': 'JANE DOE', 'phone': ['9876543210'], 'company': 'Acme', 'role': 'Dev', 'active': True,
+            'is_deleted': False,
+            'address': {'add_line': '1 Main Road', 'state': 'Kerala', 'hometown': 'Kochi', 'pincode': '682001'},
+        }
+        response = APIClient().post('/api/employees/', payload, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'name': ['A user with this name already exists.']})
+        self.assertEqual(Address.objects.count(), 1)
+
+    def test_only_the_fields_own_constraints_are_reported(self):
+        def fail(message):
+            def save():
+                raise IntegrityError(message)
+            return save
+
+        with self.assertRaises(serializers.ValidationError):
+            save_unique('name', NAME_TAKEN_MESSAGE, fail("UNIQUE constraint failed: index 'employee_name_ci_unique'"))
+        for message in (
+            'UNIQUE constraint failed: emp_det_employee.name',
+            'NOT NULL constraint failed: emp_det_employee.name',
+            'UNIQUE constraint failed: emp_det_employee.nickname',
+            "UNIQUE constraint failed: index 'project_title_ci_unique'",
+        ):
+            with self.subTest(message=message), self.assertRaises(IntegrityError):
+                save_unique('name', NAME_TAKEN_MESSAGE, fail(message))
+
+    def test_duplicate_title_is_rejected_by_constraint(self):
+        employee = make_employee('Title Owner')
+        make_project(employee, 'Apollo')
+        payload = {
+            'title': 'APOLLO', 'description': '', 'start_date': '2024-01-01T00:00:00Z',
+            'end_date': '2024-01-02T00:00:00Z', 'employee': employee.pk, 'status': 'Ongoing',
+        }
+        response = APIClient().post('/api/projects/', payload, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'title': ['A project with this title already exists.']})
+
+
+class SoftDeleteIndexTests(QueryPlanAssertionsMixin, TestCase):
+    def test_alive_employees_use_partial_index(self):
+        self.assertUsesIndex(Employee.objects.order_by('id')[:50], 'employee_alive_idx')
+        self.assertUsesIndex(Employee.objects.filter(id__gt=100).order_by('id')[:50], 'employee_alive_idx')
+
+    def test_active_employees_use_partial_index(self):
+        self.assertUsesIndex(Employee.get_all_active_employees().order_by('id')[:50], 'employee_alive_active_idx')
+        self.assertUsesIndex(
+            Employee.get_all_active_employees().with_project_counts().order_by('id')[:50],
+            'employee_alive_active_idx',
+        )
+
+    def test_alive_projects_use_partial_indexes(self):
+        self.assertUsesIndex(Project.objects.order_by('id')[:50], 'project_alive_idx')
+        self.assertUsesIndex(Project.objects.filter(employee_id=1, status='Done'), 'project_alive_emp_status_idx')
+
+
+class ListResponseCacheTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+
+    def test_list_is_served_from_cache_until_a_write(self):
+        employee = make_employee('Cached Employee')
+        before = response_cache_stats.snapshot()
+
+        first = self.client.get('/api/employees/')
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/employees/')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['X-Total-Count'], '1')
+
+        make_project(employee, 'Invalidating Project')
+        third = self.client.get('/api/employees/')
+        self.assertEqual(third.data['results'][0]['project_count'], 1)
+
+        Project.objects.filter(employee=employee).delete()
+        fourth = self.client.get('/api/employees/')
+        self.assertEqual(fourth.data['results'][0]['project_count'], 0)
+
+        after = response_cache_stats.snapshot()
+        self.assertEqual(after['hits'] - before['hits'], 1)
+        self.assertEqual(after['misses'] - before['misses'], 3)
+        self.assertGreaterEqual(after['invalidations'] - before['invalidations'], 2)
+
+
+class ConditionalRequestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.employee = make_employee('Etag Employee', role='Dev')
+        self.url = f'/api/employees/{self.employee.pk}/'
+
+    def test_unchanged_employee_returns_304_after_version_lookup(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304
+        )
+
+        address = self.employee.address
+        address.hometown = 'Thrissur'
+        address.save()
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_if_match_guards_updates(self):
+        project = make_project(self.employee, 'Etag Project')
+        url = f'/api/projects/{project.pk}/'
+        etag = self.client.get(url)['ETag']
+
+        updated = self.client.patch(url, {'description': 'changed'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(updated.status_code, 200)
+        self.assertNotEqual(updated['ETag'], etag)
+
+        stale = self.client.patch(url, {'description': 'again'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(stale.status_code, 412)
+        project.refresh_from_db()
+        self.assertEqual(project.description, 'changed')
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        first = Employee.objects.get(pk=self.employee.pk)
+        second = Employee.objects.get(pk=self.employee.pk)
+        first.role = 'Lead'
+        first.save()
+        self.assertEqual(first.version, 2)
+        # second still holds version 1; the database increments anyway.
+        second.company = 'Acme'
+        second.save()
+        self.assertEqual(second.version, 3)
+
+        second.expect_version(2)
+        with self.assertRaises(VersionConflict), transaction.atomic():
+            second.save()
+        self.assertEqual(Employee.objects.get(pk=self.employee.pk).version, 3)
+
+    def test_write_between_if_match_check_and_save_is_412(self):
+        project = make_project(self.employee, 'Racy Project')
+        url = f'/api/projects/{project.pk}/'
+        etag = self.client.get(url)['ETag']
+        get_object = ProjectRetrieveUpdateDestroyAPIView.get_object
+
+        def get_object_then_concurrent_write(view):
+            instance = get_object(view)
+            Project.objects.filter(pk=project.pk).update(description='other writer')
+            return instance
+
+        with mock.patch.object(ProjectRetrieveUpdateDestroyAPIView, 'get_object', get_object_then_concurrent_write):
+            response = self.client.patch(url, {'description': 'mine'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        # The stand-in writer shares the request's transaction, so it is
+        # rolled back with it; what matters is that 'mine' was not saved.
+        project.refresh_from_db()
+        self.assertEqual((project.description, project.version), ('', 1))
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.employee = make_employee('Sparse Employee', role='Dev', phone=['9876543210'])
+        make_project(self.employee, 'Sparse Project')
+
+    def capture(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_list_fields_skip_columns_joins_and_counts(self):
+        full, full_sql = self.capture('/api/employees/')
+        sparse, sparse_sql = self.capture('/api/employees/?fields=name')
+
+        self.assertEqual(sparse.data['results'], [{'name': 'Sparse Employee'}])
+        page_sql = sparse_sql[-1]
+        self.assertNotIn('"phone"', page_sql)
+        self.assertNotIn('emp_det_address', page_sql)
+        self.assertNotIn('COUNT(', page_sql)
+        self.assertIn('emp_det_address', full_sql[-1])
+
+        counted, _ = self.capture('/api/employees/?exclude=address,phone')
+        self.assertEqual(counted.data['results'][0]['project_count'], 1)
+        self.assertNotIn('address', counted.data['results'][0])
+
+    def test_retrieve_fields_skip_the_address_join(self):
+        url = f'/api/employees/{self.employee.pk}/'
+        full, full_sql = self.capture(url)
+        sparse, sparse_sql = self.capture(f'{url}?fields=name,role')
+
+        self.assertEqual(sparse.data, {'name': 'Sparse Employee', 'role': 'Dev'})
+        self.assertIn('emp_det_address', full_sql[-1])
+        self.assertNotIn('emp_det_address', sparse_sql[-1])
+        self.assertEqual(len(sparse_sql), len(full_sql))
+        self.assertNotIn('"phone"', sparse_sql[-1])
+        self.assertNotEqual(sparse['ETag'], full['ETag'])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get('/api/projects/?fields=title,bogus')
+        self.assertEqual(response.status_code, 400)
+
+
+class FastReadPathTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        employee = make_employee('Fast Employee', role='Dev', phone=['9876543210'])
+        make_employee('Second Employee')
+        make_project(employee, 'Fast Project')
+
+    def test_read_plan_matches_serializers(self):
+        urls = ['/api/employees/', '/api/employees/?fields=name,address', '/api/projects/']
+        fast = [self.client.get(url).json() for url in urls]
+        get_response_cache().clear()
+        with override_settings(EMP_DET_FAST_READ_PATH=False):
+            slow = [self.client.get(url).json() for url in urls]
+        self.assertEqual(fast, slow)
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_suite_measures_every_scenario_and_flags_regressions(self):
+        results = run_suite(scales=(5,), repeat=1)
+
+        by_name = {result['scenario']: result for result in results['results']}
+        self.assertEqual(set(by_name), {scenario.name for scenario in SCENARIOS})
+        self.assertEqual(by_name['employee_list']['queries'], 2)
+        self.assertGreater(by_name['report_xlsx']['peak_kb'], 0)
+        self.assertEqual(compare(results, results), [])
+
+        slower = json.loads(json.dumps(results))
+        slower['results'][0]['wall_ms'] *= 2
+        slower['results'][0]['queries'] += 1
+        regressions = compare(slower, results, {'wall_ms': 0.5})
+        self.assertEqual([r['metric'] for r in regressions], ['wall_ms', 'queries'])
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        make_employee('Timed Employee')
+
+    @override_settings(EMP_DET_INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_sampled_request_reports_server_timing_and_logs(self):
+        with self.assertLogs('emp_det.instrumentation', 'INFO') as logs:
+            response = APIClient().get('/api/employees/')
+
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        # Cache generation lookup, COUNT and the page.
+        self.assertIn('desc="3 queries"', timing)
+        for phase in ('serialize;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(phase, timing)
+        record = json.loads(logs.records[0].getMessage().split(' ', 2)[2])
+        self.assertEqual((record['path'], record['queries']), ('/api/employees/', 3))
+        self.assertEqual(len(record['slowest']), 3)
+
+    @override_settings(EMP_DET_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_disabled_instrumentation_adds_nothing(self):
+        response = APIClient().get('/api/employees/')
+        self.assertFalse(response.has_header('Server-Timing'))
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        make_employee('Metered Employee')
+
+    def sample(self, text, line_start):
+        for line in text.splitlines():
+            if line.startswith(line_start):
+                return float(line.rsplit(' ', 1)[1])
+        return 0.0
+
+    def test_requests_are_counted_per_view_and_status(self):
+        client = APIClient()
+        series = 'emp_det_http_requests_total{view="employee-list-create",method="GET",status="200"}'
+        before = self.sample(client.get('/metrics').content.decode(), series)
+        client.get('/api/employees/')
+        response = client.get('/metrics')
+
+        text = response.content.decode()
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertEqual(self.sample(text, series), before + 1)
+        self.assertIn('# TYPE emp_det_http_request_duration_seconds histogram', text)
+        self.assertIn('emp_det_http_request_duration_seconds_bucket{view="employee-list-create",method="GET",le="+Inf"}', text)
+        self.assertIn('emp_det_cache_requests_total{cache="response",result="miss"}', text)
+
+    def test_multiprocess_mode_sums_process_files(self):
+        own = metrics_registry.render()
+        with tempfile.TemporaryDirectory() as directory, override_settings(EMP_DET_METRICS_DIR=directory):
+            Path(directory, 'metrics_1.json').write_text(json.dumps({
+                'emp_det_cache_requests_total': [[['credential', 'hit'], 5]],
+                'emp_det_report_generation_seconds': [[[], [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0.05]]],
+            }))
+            merged = metrics_registry.render()
+
+        for series, extra in (
+            ('emp_det_cache_requests_total{cache="credential",result="hit"}', 5),
+            ('emp_det_report_generation_seconds_bucket{le="0.1"}', 1),
+            ('emp_det_report_generation_seconds_count', 1),
+        ):
+            self.assertEqual(self.sample(merged, series), self.sample(own, series) + extra)
+
+
+class SqliteProfileTests(TransactionTestCase):
+    def test_wal_profile_gets_pragmas_and_immediate_transactions(self):
+        # Checked on a connection of its own, whichever profile is active.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        handler = ConnectionHandler({
+            'default': {'NAME': str(Path(directory.name) / 'wal.sqlite3'), **settings.EMP_DET_SQLITE_PROFILES['wal']},
+        })
+        wal = handler['default']
+        self.addCleanup(wal.close)
+        with wal.cursor() as cursor:
+            for name in ('journal_mode', 'cache_size', 'busy_timeout'):
+                cursor.execute(f"PRAGMA {name}")
+                self.assertEqual(str(cursor.fetchone()[0]).lower(), str(wal.settings_dict['PRAGMAS'][name]).lower())
+
+        with CaptureQueriesContext(wal) as queries:
+            wal._start_transaction_under_autocommit()
+            wal.rollback()
+        self.assertEqual(queries.captured_queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+
+def make_urlconf(async_views):
+    urlconf = ModuleType(f'emp_det_urls_async_{async_views}')
+    urlconf.urlpatterns = build_urlpatterns(async_views)
+    return urlconf
+
+
+@override_settings(ROOT_URLCONF=make_urlconf(async_views=True))
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.employee = make_employee('Async Employee', role='Dev', phone=['9876543210'])
+        self.project = make_project(self.employee, 'Async Project')
+
+    def sync_get(self, url, **headers):
+        with override_settings(ROOT_URLCONF=make_urlconf(async_views=False)):
+            return APIClient().get(url, headers=headers)
+
+    async def test_reads_match_the_sync_views(self):
+        client = AsyncClient()
+        for url in (
+            '/api/employees/',
+            '/api/employees/?fields=name,project_count',
+            f'/api/employees/{self.employee.pk}/',
+            '/api/projects/',
+            f'/api/projects/{self.project.pk}/?fields=title',
+            '/api/employees/999999/',
+        ):
+            with self.subTest(url=url):
+                response = await client.get(url)
+                expected = await sync_to_async(self.sync_get)(url)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(json.loads(response.content), json.loads(expected.content))
+                self.assertEqual(response.get('ETag'), expected.get('ETag'))
+
+    async def test_conditional_get_and_writes(self):
+        client = AsyncClient()
+        url = f'/api/projects/{self.project.pk}/'
+        response = await client.get(url)
+        not_modified = await client.get(url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+        # Writes on the same URL are served by the sync view.
+        deleted = await client.delete(url)
+        self.assertEqual(deleted.status_code, 204)
+        self.assertEqual((await client.get(url)).status_code, 404)
+
+
+class ProjectDurationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.employee = make_employee('Duration Employee')
+
+    def test_duration_follows_queryset_updates_and_dates_are_checked(self):
+        project = make_project(self.employee, 'Duration Project')
+        self.assertEqual(project.duration, 10)
+
+        Project.objects.filter(pk=project.pk).update(end_date=F('start_date') + timedelta(days=3, hours=5))
+        project.refresh_from_db()
+        self.assertEqual(project.duration, 3)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Project.objects.filter(pk=project.pk).update(end_date=F('start_date') - timedelta(days=1))
+
+        response = self.client.patch(
+            f'/api/projects/{project.pk}/', {'end_date': (project.start_date - timedelta(days=1)).isoformat()},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.patch(
+            f'/api/projects/{project.pk}/', {'end_date': (project.start_date + timedelta(days=20)).isoformat()},
+            format='json',
+        )
+        self.assertEqual(response.data['duration'], 20)
+
+    def test_close_expired_projects_in_batches(self):
+        now = timezone.now()
+        for i in range(5):
+            make_project(self.employee, f'Expired {i}', start_date=now - timedelta(days=30),
+                         end_date=now - timedelta(days=1))
+        current = make_project(self.employee, 'Current', start_date=now - timedelta(days=1),
+                               end_date=now + timedelta(days=1))
+        expired = Project.objects.exclude(pk=current.pk)
+        versions = set(expired.values_list('version', flat=True))
+
+        out = io.StringIO()
+        call_command('close_expired_projects', '--dry-run', stdout=out)
+        self.assertIn('5 expired projects would be closed', out.getvalue())
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command('close_expired_projects', '--batch-size', '2', stdout=io.StringIO())
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE "emp_det_project"')]
+        self.assertEqual(len(updates), 3)
+        self.assertFalse(any(query['sql'].startswith('SELECT "emp_det_project"') for query in queries.captured_queries))
+
+        self.assertEqual(set(expired.values_list('status', flat=True)), {'Done'})
+        self.assertEqual(set(expired.values_list('version', flat=True)), {version + 1 for version in versions})
+        current.refresh_from_db()
+        self.assertEqual(current.status, 'Ongoing')
+
+
+class BulkSoftDeleteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alpha = make_employee('Alpha Employee', company='Acme')
+        self.beta = make_employee('Beta Employee', company='Globex')
+        self.alpha_projects = [make_project(self.alpha, f'Alpha {i}') for i in range(3)]
+        self.beta_project = make_project(self.beta, 'Beta Project')
+
+    def test_employee_delete_cascades_and_restore_skips_projects_deleted_earlier(self):
+        self.alpha_projects[0].delete()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/employees/bulk/delete/', {'filter': {'company': 'Acme'}}, format='json')
+        self.assertEqual(response.data, {'employees': 1, 'projects': 2})
+        self.assertEqual(sum(query['sql'].startswith('UPDATE "emp_det_') for query in queries.captured_queries
+                             if 'dataversion' not in query['sql']), 2)
+        self.assertFalse(Employee.objects.filter(pk=self.alpha.pk).exists())
+        self.assertEqual(Project.objects.filter(employee=self.alpha).count(), 0)
+        self.assertTrue(Project.objects.filter(pk=self.beta_project.pk).exists())
+
+        response = self.client.post('/api/employees/bulk/restore/', {'ids': [self.alpha.pk, self.beta.pk]},
+                                    format='json')
+        self.assertEqual(response.data, {'employees': 1, 'projects': 2})
+        self.assertEqual(
+            set(Project.objects.filter(employee=self.alpha).values_list('pk', flat=True)),
+            {project.pk for project in self.alpha_projects[1:]},
+        )
+        self.assertIsNone(Employee.objects.get(pk=self.alpha.pk).deleted_at)
+
+    def test_project_delete_and_restore_by_filter(self):
+        response = self.client.post('/api/projects/bulk/delete/', {'filter': {'employee': self.beta.pk}},
+                                    format='json')
+        self.assertEqual(response.data, {'projects': 1})
+        self.assertTrue(Project.objects.deleted_objects().get().deleted_at)
+
+        response = self.client.post('/api/projects/bulk/restore/', {'ids': [self.beta_project.pk]}, format='json')
+        self.assertEqual(response.data, {'projects': 1})
+        self.assertFalse(Project.objects.deleted_objects().exists())
+
+    def test_invalid_selection_is_rejected(self):
+        for payload in ({}, {'ids': [1], 'filter': {'company': 'Acme'}}, {'filter': {}}, {'filter': {'name': 'x'}}):
+            with self.subTest(payload=payload):
+                response = self.client.post('/api/employees/bulk/delete/', payload, format='json')
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(Employee.objects.count(), 2)
+
+
+class PurgeDeletedTests(QueryPlanAssertionsMixin, TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+        self.old = timezone.now() - timedelta(days=60)
+
+    def test_purge_archives_and_removes_expired_rows_in_batches(self):
+        kept_employee = make_employee('Kept Employee')
+        recent = make_project(kept_employee, 'Recently Deleted')
+        expired_project = make_project(kept_employee, 'Long Deleted')
+        Project.objects.filter(pk=recent.pk).delete()
+        Project.objects.filter(pk=expired_project.pk).delete(deleted_at=self.old)
+        for i in range(3):
+            employee = make_employee(f'Gone Employee {chr(65 + i)}')
+            make_project(employee, f'Gone Project {i}')
+            Employee.objects.filter(pk=employee.pk).delete(deleted_at=self.old)
+        Address.objects.create(add_line='Orphan', state='Kerala', hometown='Kochi', pincode='682001')
+
+        path = Path(self.archive_dir.name, 'purge.jsonl.gz')
+        out = io.StringIO()
+        call_command('purge_deleted', '--batch-size', '2', '--pause', '0', '--archive', str(path), stdout=out)
+        self.assertIn('3 Employee, 4 Project, 4 Address purged', out.getvalue())
+
+        self.assertEqual(list(Employee.objects.all_objects().values_list('pk', flat=True)), [kept_employee.pk])
+        self.assertEqual(list(Project.objects.all_objects().values_list('pk', flat=True)), [recent.pk])
+        self.assertEqual(Address.objects.count(), 1)
+
+        with gzip.open(path, 'rt') as archive:
+            models = [json.loads(line)['model'] for line in archive]
+        self.assertEqual(
+            (models.count('emp_det.employee'), models.count('emp_det.project'), models.count('emp_det.address')),
+            (3, 4, 4),
+        )
+
+        # Nothing left to purge; a rerun appends nothing.
+        call_command('purge_deleted', '--archive', str(path), stdout=io.StringIO())
+        with gzip.open(path, 'rt') as archive:
+            self.assertEqual(sum(1 for _ in archive), len(models))
+
+    def test_expired_rows_are_found_through_the_deleted_at_index(self):
+        self.assertUsesIndex(expired(Employee, self.old).values('pk'), 'employee_deleted_at_idx')
+        self.assertUsesIndex(expired(Project, self.old).values('pk'), 'project_deleted_at_idx')
+
+
+class SearchMigrationTests(TransactionTestCase):
+    def search_objects(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name GLOB '*_search*'")
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_migrating_back_removes_the_index_and_forward_fills_it(self):
+        self.addCleanup(call_command, 'migrate', 'emp_det', verbosity=0)
+        call_command('migrate', 'emp_det', '0018', verbosity=0)
+        self.assertEqual(self.search_objects(), set())
+        employee = make_employee('Written Unindexed')
+
+        call_command('migrate', 'emp_det', verbosity=0)
+        self.assertIn('emp_det_employee_search_ai', self.search_objects())
+        hits = APIClient().get('/api/search/', {'q': 'unindexed'}).data['results']
+        self.assertEqual([hit['id'] for hit in hits], [employee.pk])
+
+
+class PhoneMigrationTests(TransactionTestCase):
+    def phone_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB '*_phone_*'")
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_migrating_back_removes_the_triggers_and_forward_fills_the_table(self):
+        self.addCleanup(call_command, 'migrate', 'emp_det', verbosity=0)
+        call_command('migrate', 'emp_det', '0017', verbosity=0)
+        self.assertEqual(self.phone_triggers(), set())
+        employee = make_employee('Written Unsynced', phone=['9000000020'])
+
+        call_command('migrate', 'emp_det', verbosity=0)
+        self.assertEqual(self.phone_triggers(), {'emp_det_employee_phone_ai', 'emp_det_employee_phone_au'})
+        self.assertEqual(list(phones.employees_with_phone('9000000020')), [employee])
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.john = make_employee('John Mathew', role='Developer', company='Acme')
+        self.jane = make_employee('Jane Kurian', role='Tester', company='Globex')
+        self.project = make_project(self.jane, 'Payroll Migration', description='Move the Acme payroll to the cloud')
+
+    def search(self, query):
+        response = self.client.get('/api/search/', query)
+        self.assertEqual(response.status_code, 200)
+        return [(hit['type'], hit['id']) for hit in response.data['results']]
+
+    def test_prefix_search_ranks_and_snippets(self):
+        response = self.client.get('/api/search/', {'q': 'acm'})
+        hits = response.data['results']
+        # The company column outweighs the project description.
+        self.assertEqual([(hit['type'], hit['id']) for hit in hits],
+                         [('employee', self.john.pk), ('project', self.project.pk)])
+        self.assertIn('<em>Acme</em>', hits[1]['snippet'])
+        self.assertEqual(self.search({'q': 'kochi jo'}), [('employee', self.john.pk)])
+        self.assertEqual(self.search({'q': 'payroll', 'type': 'employee'}), [])
+
+    def test_index_follows_writes_and_soft_deletes(self):
+        Address.objects.filter(employee=self.jane).update(hometown='Thrissur')
+        self.assertEqual(self.search({'q': 'thrissur'}), [('employee', self.jane.pk)])
+
+        Employee.objects.filter(pk=self.jane.pk).update(role='Designer')
+        self.assertEqual(self.search({'q': 'designer'}), [('employee', self.jane.pk)])
+        self.assertEqual(self.search({'q': 'tester'}), [])
+
+        Employee.objects.filter(pk=self.jane.pk).delete()
+        self.assertEqual(self.search({'q': 'jane'}), [])
+        Employee.objects.all_objects().filter(pk=self.jane.pk).restore()
+        self.assertEqual(self.search({'q': 'jane'}), [('employee', self.jane.pk)])
+
+        self.project.delete()
+        self.assertEqual(self.search({'q': 'payroll'}), [])
+
+    def test_pagination_and_rebuild(self):
+        for i in range(3):
+            make_project(self.john, f'Report {chr(65 + i)}')
+        response = self.client.get('/api/search/', {'q': 'report', 'limit': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIn('offset=2', response.data['next'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+        make_project(self.john, 'Unindexed Project')
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM emp_det_project_search")
+        self.assertEqual(self.search({'q': 'unindexed'}), [])
+        out = io.StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('2 employees, 5 projects', out.getvalue())
+        self.assertEqual(len(self.search({'q': 'unindexed'})), 1)
+
+    def test_snippets_escape_the_indexed_text(self):
+        make_project(self.john, 'Escaping', description='<script>alert(1)</script> hello & world')
+        hits = self.client.get('/api/search/', {'q': 'hello'}).data['results']
+        self.assertEqual(hits[0]['snippet'], '&lt;script&gt;alert(1)&lt;/script&gt; <em>hello</em> &amp; world')
+
+    def test_invalid_queries_are_rejected(self):
+        for query in ({}, {'q': '" * -'}, {'q': 'john', 'type': 'address'}):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get('/api/search/', query).status_code, 400)
+        self.assertEqual(self.search({'q': '(john* -"'}), [('employee', self.john.pk)])
+
+    def test_malformed_limit_and_offset_are_rejected(self):
+        for query in ({'limit': 'abc'}, {'limit': '0'}, {'limit': '-1'}, {'offset': 'x'}, {'offset': '-2'}):
+            with self.subTest(query=query):
+                response = self.client.get('/api/search/', {'q': 'john', **query})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(query)), response.data)
+        # Over-large limits are still capped rather than rejected.
+        self.assertEqual(self.search({'q': 'john', 'limit': '5000'}), [('employee', self.john.pk)])
+
+
+class ListFilterTests(QueryPlanAssertionsMixin, TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.anna = make_employee('Anna', company='Acme', role='Developer')
+        self.bob = make_employee('Bob', company='Acme', role='Tester')
+        self.carl = make_employee('Carl', company='Globex', role='Developer', active=False)
+        Address.objects.filter(employee=self.bob).update(state='Goa', pincode='403001')
+        now = timezone.now()
+        self.old = make_project(self.anna, 'Old', status='Done', start_date=now - timedelta(days=60))
+        self.new = make_project(self.anna, 'New', start_date=now - timedelta(days=5))
+        self.other = make_project(self.bob, 'Other', start_date=now - timedelta(days=30))
+
+    def names(self, params):
+        response = self.client.get('/api/employees/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['name'] for row in response.data['results']]
+
+    def titles(self, params):
+        response = self.client.get('/api/projects/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['title'] for row in response.data['results']]
+
+    def test_employee_filters(self):
+        self.assertEqual(self.names({'company': 'Acme'}), ['Anna', 'Bob'])
+        self.assertEqual(self.names({'company': 'Acme', 'role': 'Tester'}), ['Bob'])
+        self.assertEqual(self.names({'role': 'Developer', 'active': 'false'}), ['Carl'])
+        self.assertEqual(self.names({'state': 'Goa', 'fields': 'name'}), ['Bob'])
+        response = self.client.get('/api/employees/', {'pincode': '682001', 'active': 'true'})
+        self.assertEqual(response['X-Total-Count'], '1')
+
+    def test_project_filters(self):
+        since = (timezone.now() - timedelta(days=40)).isoformat()
+        self.assertEqual(self.titles({'start_after': since}), ['New', 'Other'])
+        self.assertEqual(self.titles({'status': 'Ongoing', 'start_after': since}), ['New', 'Other'])
+        self.assertEqual(self.titles({'employee': self.anna.pk, 'status': 'Done'}), ['Old'])
+        self.assertEqual(self.titles({'status': 'Done', 'end_before': since}), ['Old'])
+
+    def test_unsupported_combinations_and_values_are_rejected(self):
+        for path, params in (
+            ('/api/employees/', {'company': 'Acme', 'state': 'Goa'}),
+            ('/api/employees/', {'role': 'Tester', 'pincode': '403001'}),
+            ('/api/employees/', {'active': 'maybe'}),
+            ('/api/employees/', {'ordering': 'company'}),
+            ('/api/projects/', {'employee': self.anna.pk, 'start_after': '2024-01-01T00:00:00Z'}),
+            ('/api/projects/', {'start_after': '2024-01-01T00:00:00Z', 'end_before': '2024-01-01T00:00:00Z'}),
+            ('/api/projects/', {'status': 'Paused'}),
+        ):
+            with self.subTest(path=path, params=params):
+                self.assertEqual(self.client.get(path, params).status_code, 400)
+
+    def test_ordering_pages_with_the_cursor(self):
+        first = self.client.get('/api/projects/', {'ordering': '-start_date', 'page_size': 2, 'fields': 'title'})
+        self.assertEqual([row['title'] for row in first.data['results']], ['New', 'Other'])
+        second = self.client.get(first.data['next'])
+        self.assertEqual([row['title'] for row in second.data['results']], ['Old'])
+        self.assertEqual(self.names({'ordering': '-name'}), ['Bob', 'Anna'])
+
+    def test_supported_combinations_use_indexes(self):
+        alive = Employee.objects.filter(active=True)
+        self.assertUsesIndex(alive.filter(company='Acme', role='Tester'), 'employee_company_role_idx')
+        self.assertUsesIndex(alive.filter(role='Tester'), 'employee_role_idx')
+        self.assertUsesIndex(Address.objects.filter(state='Goa', pincode='403001'), 'address_state_pincode_idx')
+        self.assertUsesIndex(Address.objects.filter(pincode='403001'), 'address_pincode_idx')
+        since = timezone.now()
+        self.assertUsesIndex(Project.objects.filter(status='Done', start_date__gte=since), 'project_status_start_idx')
+        self.assertUsesIndex(Project.objects.filter(status='Done', end_date__lte=since), 'project_status_end_idx')
+        self.assertUsesIndex(Project.objects.filter(start_date__gte=since), 'project_start_idx')
+        self.assertUsesIndex(Project.objects.filter(end_date__lte=since), 'project_end_idx')
+
+
+class EmployeePhoneTests(QueryPlanAssertionsMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.anna = make_employee('Anna', phone=['9000000001', '9000000002'])
+        self.bob = make_employee('Bob', phone=['9000000003'])
+
+    def payload(self, name, phone):
+        return {
+            'name': name, 'phone': phone, 'company': 'Acme', 'role': 'Dev', 'active': True, 'is_deleted': False,
+            'address': {'add_line': '1 Main Road', 'state': 'Kerala', 'hometown': 'Kochi', 'pincode': '682001'},
+        }
+
+    def numbers(self, employee):
+        return sorted(employee.phone_numbers.values_list('number', flat=True))
+
+    def test_phone_table_follows_the_json_list(self):
+        self.assertEqual(self.numbers(self.anna), ['9000000001', '9000000002'])
+        Employee.objects.filter(pk=self.anna.pk).update(phone=['9000000009'])
+        self.assertEqual(self.numbers(self.anna), ['9000000009'])
+        address = Address.objects.create(add_line='2 Main Road', state='Kerala', hometown='Kochi', pincode='682001')
+        Employee.objects.bulk_create([Employee(name='Carl', phone=['9000000010'], address=address)])
+        self.assertEqual(self.numbers(Employee.objects.get(name='Carl')), ['9000000010'])
+        self.bob.delete()
+        self.assertFalse(EmployeePhone.objects.filter(number='9000000003').exists())
+
+    def test_reverse_lookup(self):
+        response = self.client.get('/api/employees/by-phone/9000000002/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['employees'], [
+            {'id': self.anna.pk, 'name': 'Anna', 'company': '', 'role': ''},
+        ])
+        Employee.objects.filter(pk=self.anna.pk).delete()
+        self.assertEqual(self.client.get('/api/employees/by-phone/9000000002/').status_code, 404)
+
+    def test_lookup_normalizes_the_number(self):
+        for number in ('90000-00002', '+91 9000000002', '09000000002', '(+91) 90000 00002'):
+            with self.subTest(number=number):
+                response = self.client.get(f'/api/employees/by-phone/{number}/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['phone'], '9000000002')
+                self.assertEqual([employee['id'] for employee in response.data['employees']], [self.anna.pk])
+        for number in ('900000000', '+1 9000000002', 'phone'):
+            with self.subTest(number=number):
+                self.assertEqual(self.client.get(f'/api/employees/by-phone/{number}/').status_code, 400)
+
+    def test_stored_numbers_are_normalized(self):
+        # Rows written around the serializer's format check.
+        Employee.objects.filter(pk=self.bob.pk).update(phone=['+91 90000-00030', '090000 00031', '12345'])
+        self.assertEqual(self.numbers(self.bob), ['9000000030', '9000000031'])
+        self.assertEqual(phones.phone_owners(['+919000000030', 'bad']), {'9000000030': [self.bob.pk]})
+
+    def test_duplicate_phones_are_rejected(self):
+        response = self.client.post('/api/employees/', self.payload('Dora', ['9000000003']), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'phone': ['Phone number 9000000003 already belongs to another employee.']})
+
+        # An employee keeps its own numbers on update.
+        response = self.client.put(f'/api/employees/{self.bob.pk}/', self.payload('Bob', ['9000000003']), format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['phone'], ['9000000003'])
+
+        # Numbers of soft-deleted employees can be reused.
+        Employee.objects.filter(pk=self.bob.pk).delete()
+        response = self.client.post('/api/employees/', self.payload('Dora', ['9000000003']), format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_lookups_use_the_number_index(self):
+        self.assertUsesIndex(EmployeePhone.objects.filter(number='9000000001'), 'employee_phone_number_idx')
+
 
-# Create your tests here.
@@ -1,21 +1,61 @@
+from django.conf import settings
 from django.urls import path
+
+from .async_support import AsyncAPIView
 from .views import (
     EmployeeListCreateAPIView,
+    EmployeeBulkCreateAPIView,
+    EmployeeBulkSoftDeleteAPIView,
+    ProjectBulkSoftDeleteAPIView,
     EmployeeRetrieveUpdateDestroyAPIView,
     ProjectListCreateAPIView,
     ProjectRetrieveUpdateDestroyAPIView,
     EmployeeReportAPIView,
+    ReportJobCreateAPIView,
+    ReportJobRetrieveAPIView,
+    ReportJobDownloadAPIView,
+    EmployeeExportAPIView,
+    ProjectExportAPIView,
+    CacheStatsAPIView,
+    MetricsAPIView,
+    SearchAPIView,
+    EmployeePhoneLookupAPIView,
 )
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
-urlpatterns = [
-    path('api/employees/', EmployeeListCreateAPIView.as_view(), name='employee-list-create'),
-    path('api/employees/<int:pk>/', EmployeeRetrieveUpdateDestroyAPIView.as_view(), name='employee-retrieve-update-destroy'),
-    path('api/projects/', ProjectListCreateAPIView.as_view(), name='project-list-create'),
-    path('api/projects/<int:pk>/', ProjectRetrieveUpdateDestroyAPIView.as_view(), name='project-retrieve-update-destroy'),
+
+def build_urlpatterns(async_views=False):
+    """With ``async_views``, GET on the read endpoints is served by async handlers."""
+    def read_view(view):
+        return AsyncAPIView.as_view(drf_view=view) if async_views else view.as_view()
+
+    return [
+        path('api/employees/', read_view(EmployeeListCreateAPIView), name='employee-list-create'),
+        path('api/employees/bulk/', EmployeeBulkCreateAPIView.as_view(), name='employee-bulk-create'),
+        path('api/employees/bulk/delete/', EmployeeBulkSoftDeleteAPIView.as_view(operation='delete'), name='employee-bulk-delete'),
+        path('api/employees/bulk/restore/', EmployeeBulkSoftDeleteAPIView.as_view(operation='restore'), name='employee-bulk-restore'),
+        path('api/employees/<int:pk>/', read_view(EmployeeRetrieveUpdateDestroyAPIView), name='employee-retrieve-update-destroy'),
+        path('api/projects/', read_view(ProjectListCreateAPIView), name='project-list-create'),
+        path('api/projects/bulk/delete/', ProjectBulkSoftDeleteAPIView.as_view(operation='delete'), name='project-bulk-delete'),
+        path('api/projects/bulk/restore/', ProjectBulkSoftDeleteAPIView.as_view(operation='restore'), name='project-bulk-restore'),
+        path('api/projects/<int:pk>/', read_view(ProjectRetrieveUpdateDestroyAPIView), name='project-retrieve-update-destroy'),
+        path('api/employees/reports/jobs/<uuid:pk>/download/', read_view(ReportJobDownloadAPIView), name='employee-report-job-download'),
+    ]
+
+
+urlpatterns = build_urlpatterns(getattr(settings, 'EMP_DET_ASYNC_VIEWS', False)) + [
+    
+    path('api/employees/export/<str:export_format>/', EmployeeExportAPIView.as_view(), name='employee-export'),
+    path('api/projects/export/<str:export_format>/', ProjectExportAPIView.as_view(), name='project-export'),
+    path('api/cache/stats/', CacheStatsAPIView.as_view(), name='cache-stats'),
+    path('metrics', MetricsAPIView.as_view(), name='metrics'),
+    path('api/search/', SearchAPIView.as_view(), name='search'),
+    path('api/employees/by-phone/<str:number>/', EmployeePhoneLookupAPIView.as_view(), name='employee-phone-lookup'),
     
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/schema/docs', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     
     path('api/employees/reports/', EmployeeReportAPIView.as_view(), name='employee-report'),
+    path('api/employees/reports/jobs/', ReportJobCreateAPIView.as_view(), name='employee-report-job-create'),
+    path('api/employees/reports/jobs/<uuid:pk>/', ReportJobRetrieveAPIView.as_view(), name='employee-report-job'),
 ]
@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import F
+
+# Models whose rows feed the employee report and the list endpoints.
+TRACKED_MODELS = ('Address', 'Employee', 'Project')
+
+_pending = ContextVar('emp_det_pending_version_bumps', default=None)
+
+
+def bump_version(model):
+    """Advance the generation counter for ``model`` (a class or its name)."""
+    from .models import DataVersion
+
+    name = model if isinstance(model, str) else model.__name__
+    pending = _pending.get()
+    if pending is not None:
+        pending.add(name)
+        return
+    if not DataVersion.objects.filter(name=name).update(version=F('version') + 1):
+        _, created = DataVersion.objects.get_or_create(name=name, defaults={'version': 1})
+        if not created:
+            DataVersion.objects.filter(name=name).update(version=F('version') + 1)
+
+
+@contextmanager
+def coalesced_bumps():
+    """
+    Bump each model's counter once when the block exits, instead of once per
+    row: deletes send post_delete for every row they remove.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+        for name in sorted(pending):
+            bump_version(name)
+
+
+def get_versions(names=TRACKED_MODELS):
+    from .models import DataVersion
+
+    versions = dict.fromkeys(names, 0)
+    versions.update(DataVersion.objects.filter(name__in=names).values_list('name', 'version'))
+    return versions
+
+
+async def aget_versions(names=TRACKED_MODELS):
+    from .models import DataVersion
+
+    versions = dict.fromkeys(names, 0)
+    async for name, version in DataVersion.objects.filter(name__in=names).values_list('name', 'version'):
+        versions[name] = version
+    return versions
+
+
+def format_stamp(names, versions):
+    return '-'.join(f"{name.lower()}{versions[name]}" for name in names)
+
+
+def data_version_stamp(names=TRACKED_MODELS):
+    """A string that changes whenever any row of the given models changes."""
+    return format_stamp(names, get_versions(names))
+
+
+async def adata_version_stamp(names=TRACKED_MODELS):
+    return format_stamp(names, await aget_versions(names))
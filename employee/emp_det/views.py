@@ -1,22 +1,63 @@
-from rest_framework import generics, status
-from .models import Employee, Project
-from .serializers import EmployeeSerializer, ProjectSerializer, EmployeeGetSerializer, ProjectGetSerializer
+from rest_framework import generics, serializers, status
+from .models import Employee, Project, ReportJob
+from .serializers import EmployeeSerializer, ProjectSerializer, EmployeeGetSerializer, ProjectGetSerializer, ReportJobSerializer
+from .serializers import EmployeeBulkSelectionSerializer, ProjectBulkSelectionSerializer
+from .pagination import KeysetPagination, SearchPagination
 from rest_framework import status
 from rest_framework.response import Response
 import logging
 # from rest_framework.permissions import IsAuthenticated
 # from emp_det.authentication import CustomAuthentication
 from django.http import JsonResponse
+from django.conf import settings
+from django.db import IntegrityError
 
-from openpyxl import Workbook
 from rest_framework.views import APIView
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from pathlib import Path
+from .bulk import (
+    bulk_create_employees, restore_employees, restore_projects, soft_delete_employees, soft_delete_projects,
+)
+from .caching import CachedListMixin, response_cache_stats
+from .async_support import AsyncReadMixin
+from .conditional import ConditionalRequestMixin
+from .fastpath import get_read_plan
+from .fieldsets import SparseFieldsetViewMixin
+from .filters import ListFilter, ListFilterViewMixin
+from .instrumentation import timed
+from .credentials import credential_cache
+from .exports import EMPLOYEE_EXPORT, PROJECT_EXPORT, ExportError, export_stream
+from .jobs import cached_artifact, submit_report_job
+from .metrics import PROMETHEUS_CONTENT_TYPE, registry as metrics_registry
+from .phones import employees_with_phone, normalize_phone
+from .search import SEARCH_TYPES, match_expression, search
+from .reports import XLSX_CONTENT_TYPE, build_report_workbook, iter_report_rows, stream_report_xlsx
 from django.shortcuts import redirect
 
 
 logger = logging.getLogger(__name__)
 
-class EmployeeListCreateAPIView(generics.ListCreateAPIView):
+class EmployeeListCreateAPIView(AsyncReadMixin, CachedListMixin, ListFilterViewMixin, SparseFieldsetViewMixin,
+                                generics.ListCreateAPIView):
+    pagination_class = KeysetPagination
+    list_filters = {
+        'company': ListFilter('company', serializers.CharField()),
+        'role': ListFilter('role', serializers.CharField()),
+        'active': ListFilter('active', serializers.BooleanField(), default=True),
+        'state': ListFilter('address__state', serializers.CharField(), column='state'),
+        'pincode': ListFilter('address__pincode', serializers.CharField(), column='pincode'),
+    }
+    # Composite indexes on Employee and Address (see models.py).
+    filter_indexes = (('company', 'role'), ('role',), ('state', 'pincode'), ('pincode',))
+    unindexed_filters = ('active',)
+    orderings = ('id', 'name')
+    cache_models = ('Address', 'Employee', 'Project')
+    fieldset_columns = {'address': ('address__add_line', 'address__state', 'address__hometown', 'address__pincode')}
+    count_annotations = {
+        'project_count': 'project_total',
+        'ongoing_project_count': 'project_ongoing',
+        'completed_project_count': 'project_done',
+    }
     # authentication_classes = [CustomAuthentication]
     # permission_classes = [IsAuthenticated]
     
@@ -31,30 +72,65 @@ class EmployeeListCreateAPIView(generics.ListCreateAPIView):
         #     logger.warning("Unauthenticated access attempt by user: %s", user)
         #     return self.handle_unauthenticated_user(request)
         
-        return self.list(request, *args, **kwargs)
+        return self.cached_list(request, *args, **kwargs)
 
     # def handle_unauthenticated_user(self, request):
     #     return JsonResponse({'detail': 'Authentication required'}, status=401)
     
+    async def aget(self, request, *args, **kwargs):
+        return await self.acached_list(request, *args, **kwargs)
+
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        queryset, plan = self.get_page_queryset()
+        page = self.paginate_queryset(queryset)
+        # logger.info("(list)queryset: %s", queryset)
+        return self.page_response(request, page, plan)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset, plan = self.get_page_queryset()
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        return await self.apage_response(request, page, plan)
 
-        if self.emp_found:
+    def page_response(self, request, page, plan):
+        # An empty first page replaces the old queryset.exists() round-trip.
+        if not page and not self.paginator.has_cursor(request):
             return Response({"detail": "No employees found."}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = self.get_serializer(queryset, many=True)
-        # logger.info("(list)queryset: %s", queryset)
-        return Response(serializer.data)
+        with timed('serialize'):
+            if plan is not None:
+                data = plan.serialize_many(page)
+            else:
+                data = self.get_serializer(page, many=True).data
+        return self.get_paginated_response(data)
+
+    def get_page_queryset(self):
+        queryset = self.get_queryset()
+        plan = self.get_read_plan()
+        if plan is not None:
+            extra = [name for name in self.fieldset_extra_columns() if name not in plan.columns]
+            queryset = queryset.values('id', *plan.columns, *extra)
+        return queryset, plan
+
+    def get_read_plan(self):
+        if not getattr(settings, 'EMP_DET_FAST_READ_PATH', True):
+            return None
+        return get_read_plan(EmployeeGetSerializer, self.get_fieldset(), self.count_annotations)
 
     def get_queryset(self):
-        queryset = Employee.get_all_active_employees()
-        self.emp_found = not queryset.exists()
+        # Joins and count aggregates only for the fields that ?fields= keeps.
+        counts = [annotation for name, annotation in self.count_annotations.items() if self.wants_field(name)]
+        queryset = self.filter_list_queryset(Employee.objects.get_queryset())
+        queryset = queryset.with_project_counts(counts, address=self.wants_field('address'))
         # logger.info("(get_queryset)queryset: %s", queryset)
-        return queryset
+        return self.narrow_queryset(queryset)
+
+    def get_count_queryset(self):
+        return self.filter_list_queryset(Employee.objects.get_queryset())
 
     def get_serializer(self, *args, **kwargs):
         serializer_class = self.get_serializer_class()
         # kwargs.setdefault('context', self.get_serializer_context())
+        kwargs.setdefault('fields', self.get_fieldset())
         return serializer_class(*args, **kwargs)
 
     def get_serializer_class(self):
@@ -82,34 +158,125 @@ class EmployeeListCreateAPIView(generics.ListCreateAPIView):
         serializer.save(user = self.request.user)
 
 
-class EmployeeRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class EmployeeBulkCreateAPIView(APIView):
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        records = request.data
+        if not isinstance(records, list):
+            return Response({"detail": "Expected a list of employees."}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_records = getattr(settings, 'EMP_DET_BULK_MAX_RECORDS', 10000)
+        if len(records) > max_records:
+            return Response({"detail": f"At most {max_records} employees per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            batch_size = int(request.query_params.get('batch_size', 0)) or None
+        except ValueError:
+            return Response({"detail": "batch_size must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = bulk_create_employees(records, batch_size=batch_size)
+        except IntegrityError:
+            logger.exception("bulk employee create conflicted with a concurrent write")
+            return Response({"detail": "A concurrent write conflicted with this batch; nothing was created."},
+                            status=status.HTTP_409_CONFLICT)
+
+        created = sum(1 for result in results if result['status'] == 'created')
+        if created == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_200_OK
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({"created": created, "failed": len(results) - created, "results": results},
+                        status=response_status)
+
+
+class BulkSoftDeleteAPIView(APIView):
+    """
+    POST ``{"ids": [...]}`` or ``{"filter": {...}}`` to soft-delete (or, with
+    ``operation='restore'``, restore) the selected rows in a fixed number of
+    UPDATEs. Responds with the affected row counts per model.
+    """
+    model = None
+    selection_serializer_class = None
+    operations = {}
+    operation = 'delete'
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.selection_serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        selection = serializer.validated_data
+        queryset = self.model.objects.all_objects()
+        if 'ids' in selection:
+            queryset = queryset.filter(pk__in=selection['ids'])
+        else:
+            queryset = queryset.filter(**selection['filter'])
+        counts = self.operations[self.operation](queryset)
+        logger.info("bulk %s of %s: %s", self.operation, self.model.__name__, counts)
+        return Response(counts)
+
+
+class EmployeeBulkSoftDeleteAPIView(BulkSoftDeleteAPIView):
+    """Also soft-deletes the employees' projects, and restores the ones deleted with them."""
+    model = Employee
+    selection_serializer_class = EmployeeBulkSelectionSerializer
+    operations = {'delete': soft_delete_employees, 'restore': restore_employees}
+
+
+class ProjectBulkSoftDeleteAPIView(BulkSoftDeleteAPIView):
+    model = Project
+    selection_serializer_class = ProjectBulkSelectionSerializer
+    operations = {'delete': soft_delete_projects, 'restore': restore_projects}
+
+
+class EmployeeRetrieveUpdateDestroyAPIView(AsyncReadMixin, ConditionalRequestMixin, SparseFieldsetViewMixin,
+                                           generics.RetrieveUpdateDestroyAPIView):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     lookup_field = 'pk'
+    version_fields = (('version', 'updated_at'), ('address__version', 'address__updated_at'))
     # authentication_classes = [CustomAuthentication]
     # permission_classes = [IsAuthenticated]
     
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    def get_queryset(self):
+        # The address is serialized with the employee: one query, and no
+        # lazy load for the async retrieve.
+        queryset = super().get_queryset()
+        if self.wants_field('address'):
+            queryset = queryset.select_related('address')
+        return queryset
     
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        not_modified = self.conditional_response(request)
+        if not_modified is not None:
+            return not_modified
 
-    def update(self, request, *args, **kwargs):
-        partial = kwargs.pop('partial', False)
         instance = self.get_object()
-        serializer = self.get_serializer(instance, data=request.data, partial=partial)
-        serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+        with timed('serialize'):
+            data = self.get_serializer(instance).data
+        return self.set_validators(Response(data))
 
-        if getattr(instance, '_prefetched_objects_cache', None):
-            # If 'prefetch_related' has been applied to a queryset, we need to
-            # forcibly invalidate the prefetch cache on the instance.
-            instance._prefetched_objects_cache = {}
+    async def aretrieve(self, request, *args, **kwargs):
+        not_modified = await self.aconditional_response(request)
+        if not_modified is not None:
+            return not_modified
 
-        return Response(serializer.data)
+        instance = await self.aget_object()
+        with timed('serialize'):
+            data = self.get_serializer(instance).data
+        return self.set_validators(Response(data))
 
     def partial_update(self, request, *args, **kwargs):
         kwargs['partial'] = True
@@ -124,29 +291,73 @@ class EmployeeRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
         instance.delete()
 
 
-class ProjectListCreateAPIView(generics.ListCreateAPIView):
+class ProjectListCreateAPIView(AsyncReadMixin, CachedListMixin, ListFilterViewMixin, SparseFieldsetViewMixin,
+                               generics.ListCreateAPIView):
     queryset = Project.objects.all()
+    pagination_class = KeysetPagination
+    list_filters = {
+        'status': ListFilter('status', serializers.ChoiceField(choices=Project.STATUS_CHOICES)),
+        'employee': ListFilter('employee', serializers.IntegerField()),
+        'start_after': ListFilter('start_date__gte', serializers.DateTimeField()),
+        'start_before': ListFilter('start_date__lte', serializers.DateTimeField()),
+        'end_after': ListFilter('end_date__gte', serializers.DateTimeField()),
+        'end_before': ListFilter('end_date__lte', serializers.DateTimeField()),
+    }
+    # Partial indexes on live projects (see models.py).
+    filter_indexes = (
+        ('employee', 'status'), ('status', 'start_date'), ('status', 'end_date'), ('start_date',), ('end_date',),
+    )
+    orderings = ('id', 'title', 'start_date', 'end_date')
+    cache_models = ('Project',)
     # authentication_classes = [CustomAuthentication]
     # permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        return self.list(request, *args, **kwargs)
+        return self.cached_list(request, *args, **kwargs)
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.acached_list(request, *args, **kwargs)
     
     def get_queryset(self):
-        queryset = Project.objects.filter()
-        self.emp_found = not queryset.exists()
+        queryset = self.filter_list_queryset(Project.objects.all())
         # logger.info("(get_queryset)queryset: %s", queryset)
-        return queryset
+        return self.narrow_queryset(queryset)
     
     def list(self, request, *args, **kwargs):
-        queryset = Project.objects.all()
+        queryset, plan = self.get_page_queryset()
+        page = self.paginate_queryset(queryset)
+        return self.page_response(request, page, plan)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset, plan = self.get_page_queryset()
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        return await self.apage_response(request, page, plan)
+
+    def page_response(self, request, page, plan):
+        with timed('serialize'):
+            if plan is not None:
+                data = plan.serialize_many(page)
+            else:
+                data = self.get_serializer(page, many=True).data
+        return self.get_paginated_response(data)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    def get_page_queryset(self):
+        queryset = self.get_queryset()
+        plan = self.get_read_plan()
+        if plan is not None:
+            extra = [name for name in self.fieldset_extra_columns() if name not in plan.columns]
+            queryset = queryset.values('id', *plan.columns, *extra)
+        return queryset, plan
+
+    def get_read_plan(self):
+        if not getattr(settings, 'EMP_DET_FAST_READ_PATH', True):
+            return None
+        return get_read_plan(ProjectGetSerializer, self.get_fieldset())
     
     def get_serializer(self, *args, **kwargs):
         serializer_class = self.get_serializer_class()
         kwargs.setdefault('context', self.get_serializer_context())
+        kwargs.setdefault('fields', self.get_fieldset())
         return serializer_class(*args, **kwargs)
     
     def post(self, request, *args, **kwargs):
@@ -167,28 +378,36 @@ class ProjectListCreateAPIView(generics.ListCreateAPIView):
         return super().get_serializer_class()
 
 
-class ProjectRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectRetrieveUpdateDestroyAPIView(AsyncReadMixin, ConditionalRequestMixin, SparseFieldsetViewMixin,
+                                          generics.RetrieveUpdateDestroyAPIView):
+    queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     lookup_field = 'pk'
     # authentication_classes = [CustomAuthentication]
     # permission_classes = [IsAuthenticated]
 
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
-    
-    def update(self, request, *args, **kwargs):
-        partial = kwargs.pop('partial', False)
-        instance = self.get_object()
-        serializer = self.get_serializer(instance, data=request.data, partial=partial)
-        serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+    async def aget(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
 
-        if getattr(instance, '_prefetched_objects_cache', None):
-            instance._prefetched_objects_cache = {}
+    def retrieve(self, request, *args, **kwargs):
+        not_modified = self.conditional_response(request)
+        if not_modified is not None:
+            return not_modified
 
-        return Response(serializer.data)
+        instance = self.get_object()
+        with timed('serialize'):
+            data = self.get_serializer(instance).data
+        return self.set_validators(Response(data))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        not_modified = await self.aconditional_response(request)
+        if not_modified is not None:
+            return not_modified
+
+        instance = await self.aget_object()
+        with timed('serialize'):
+            data = self.get_serializer(instance).data
+        return self.set_validators(Response(data))
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -201,40 +420,159 @@ class EmployeeReportAPIView(APIView):
     # permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Employee Report"
-
-        headers = ["Name", "Role", "Company", "Phone", "Active", "Project Title", "Project Status"]
-        ws.append(headers)
-        
-        employees = Employee.objects.prefetch_related('projects').all()
-        
-        for employee in employees:
-            phones = ", ".join(employee.phone) if isinstance(employee.phone, list) else ""
-
-            if employee.projects.exists():
-                for project in employee.projects.all():
-                    ws.append([
-                        employee.name,
-                        employee.role,
-                        employee.company,
-                        phones,
-                        employee.active,
-                        project.title,
-                        project.status
-                    ])
-            else:
-                ws.append([
-                    employee.name,
-                    employee.role,
-                    employee.company,
-                    phones,
-                    employee.active,
-                ])
-
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        # Serve the artifact of a finished report job when the data is unchanged.
+        path = cached_artifact()
+        if path:
+            return FileResponse(open(path, 'rb'), as_attachment=True, filename='employee_report.xlsx',
+                                content_type=XLSX_CONTENT_TYPE)
+
+        rows = iter_report_rows()
+
+        # Streaming is the default; ?stream=false builds the file first so
+        # the response carries a Content-Length.
+        if request.query_params.get('stream', 'true').lower() in ('0', 'false', 'no', 'off'):
+            response = HttpResponse(content_type=XLSX_CONTENT_TYPE)
+            build_report_workbook(rows).save(response)
+        else:
+            response = StreamingHttpResponse(stream_report_xlsx(rows), content_type=XLSX_CONTENT_TYPE)
         response['Content-Disposition'] = 'attachment; filename=employee_report.xlsx'
-        wb.save(response)
-        
+
+        return response
+
+
+class ReportJobCreateAPIView(generics.CreateAPIView):
+    serializer_class = ReportJobSerializer
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def create(self, request, *args, **kwargs):
+        job, created = submit_report_job()
+        serializer = self.get_serializer(job)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK)
+
+
+class ReportJobRetrieveAPIView(generics.RetrieveAPIView):
+    queryset = ReportJob.objects.all()
+    serializer_class = ReportJobSerializer
+    lookup_field = 'pk'
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+
+class ReportJobDownloadAPIView(AsyncReadMixin, generics.GenericAPIView):
+    queryset = ReportJob.objects.all()
+    lookup_field = 'pk'
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return self.download_response(self.get_object())
+
+    async def aget(self, request, *args, **kwargs):
+        return self.download_response(await self.aget_object())
+
+    def download_response(self, job):
+        if job.status != 'Done':
+            return Response({"detail": f"Report job is {job.status}."}, status=status.HTTP_409_CONFLICT)
+
+        path = Path(job.file_path)
+        if not path.exists():
+            return Response({"detail": "Report file has expired."}, status=status.HTTP_410_GONE)
+
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename='employee_report.xlsx',
+                            content_type=XLSX_CONTENT_TYPE)
+
+
+class ExportAPIView(APIView):
+    """
+    Flat CSV/NDJSON export streamed from a chunked values_list() query.
+
+    Query parameters: ``columns`` (comma separated), ``deleted``
+    (exclude/only/include) and the per-export filters from exports.py.
+    """
+    export_spec = None
+    filename = None
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def get(self, request, export_format, *args, **kwargs):
+        try:
+            stream, content_type = export_stream(self.export_spec, export_format, request.query_params)
+        except ExportError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename={self.filename}.{export_format}'
         return response
+
+
+class EmployeeExportAPIView(ExportAPIView):
+    export_spec = EMPLOYEE_EXPORT
+    filename = 'employees'
+
+
+class ProjectExportAPIView(ExportAPIView):
+    export_spec = PROJECT_EXPORT
+    filename = 'projects'
+
+
+class CacheStatsAPIView(APIView):
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            "response_cache": response_cache_stats.snapshot(),
+            "credential_cache": credential_cache.stats(),
+        })
+
+
+class MetricsAPIView(APIView):
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        # Prometheus text format, summed over worker processes when EMP_DET_METRICS_DIR is set.
+        return HttpResponse(metrics_registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+class SearchAPIView(APIView):
+    """Full-text search over live employees and projects, best matches first."""
+    pagination_class = SearchPagination
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        text = request.query_params.get('q', '')
+        if not match_expression(text):
+            return Response({"detail": "q must contain at least one word."}, status=status.HTTP_400_BAD_REQUEST)
+
+        kind = request.query_params.get('type')
+        if kind and kind not in SEARCH_TYPES:
+            return Response({"detail": f"type must be one of: {', '.join(SEARCH_TYPES)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        types = (kind,) if kind else tuple(SEARCH_TYPES)
+
+        paginator = self.pagination_class()
+        with timed('search'):
+            hits = paginator.paginate_hits(lambda limit, offset: search(text, types, limit, offset), request)
+        return paginator.get_paginated_response(hits)
+
+
+class EmployeePhoneLookupAPIView(APIView):
+    """
+    Live employees listing a phone number, via the indexed phone table. The
+    number may carry separators and the +91/0 prefix.
+    """
+    # authentication_classes = [CustomAuthentication]
+    # permission_classes = [IsAuthenticated]
+
+    def get(self, request, number, *args, **kwargs):
+        number = normalize_phone(number)
+        if number is None:
+            return Response({"detail": "Expected a 10-digit phone number, optionally with separators and a +91 or 0 prefix."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        employees = list(employees_with_phone(number).values('id', 'name', 'company', 'role'))
+        if not employees:
+            return Response({"detail": "No employee has this phone number."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"phone": number, "employees": employees})
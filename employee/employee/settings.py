@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,6 +51,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'emp_det.instrumentation.InstrumentationMiddleware',
+    'emp_det.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -85,13 +88,44 @@ WSGI_APPLICATION = 'employee.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# SQLite profiles, picked with the EMP_DET_DB_PROFILE environment variable.
+# "wal" lets readers run alongside a writer: WAL journal, pragmas applied on
+# every new connection (PRAGMAS, see emp_det/signals.py), persistent
+# connections and BEGIN IMMEDIATE for atomic blocks (emp_det/db/sqlite3).
+# "basic" is Django's stock SQLite setup and the default; deployments opt in
+# to "wal" (which also switches the database file's journal mode for every
+# user of it). Compare them with `manage.py benchmark_concurrency`.
+EMP_DET_SQLITE_PROFILES = {
+    'basic': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
         'OPTIONS': {
             'timeout': 20,
-        }
+        },
+    },
+    'wal': {
+        'ENGINE': 'emp_det.db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
+        'PRAGMAS': {
+            'busy_timeout': 20000,
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -64000,
+            'mmap_size': 268435456,
+            'temp_store': 'MEMORY',
+        },
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+}
+EMP_DET_DB_PROFILE = os.environ.get('EMP_DET_DB_PROFILE', 'basic')
+
+DATABASES = {
+    'default': {
+        'NAME': BASE_DIR / 'db.sqlite3',
+        **EMP_DET_SQLITE_PROFILES[EMP_DET_DB_PROFILE],
     }
 }
 
@@ -156,8 +190,90 @@ REST_FRAMEWORK = {
     #     'emp_det.authentication.CustomAuthentication',
     # ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'emp_det.instrumentation.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'PAGE_SIZE': 50,
 }
 
+# PAGE_SIZE is global but pagination_class is set per list view.
+SILENCED_SYSTEM_CHECKS = ['rest_framework.W001']
+
+# Report jobs run on an in-process thread pool and keep finished files here,
+# keyed on the Address/Employee/Project data version.
+EMP_DET_REPORT_DIR = BASE_DIR / 'reports'
+EMP_DET_REPORT_WORKERS = 2
+EMP_DET_REPORT_JOB_TIMEOUT = 3600
+# Seconds a superseded report file is kept after it was written, and a job
+# row after it was created (see jobs.prune_reports).
+EMP_DET_REPORT_ARTIFACT_RETENTION = 3600
+EMP_DET_REPORT_JOB_RETENTION = 7 * 24 * 3600
+
+# Bulk employee create: records per request and rows per INSERT.
+EMP_DET_BULK_MAX_RECORDS = 10000
+EMP_DET_BULK_BATCH_SIZE = 500
+
+# purge_deleted: soft-deleted rows older than the retention window are
+# archived to EMP_DET_ARCHIVE_DIR and removed, in batches with a pause between
+# them so the command does not hold the SQLite write lock for long.
+EMP_DET_PURGE_RETENTION_DAYS = 30
+EMP_DET_PURGE_BATCH_SIZE = 500
+EMP_DET_PURGE_PAUSE = 0.2
+EMP_DET_ARCHIVE_DIR = BASE_DIR / 'archive'
+
+# Verified Basic-auth credentials cache (per process, see emp_det/credentials.py).
+# Entries are checked against a per-user stamp in the STAMP_CACHE alias; point
+# it at a cache shared by all workers (Redis, Memcached) so password changes
+# and deactivations apply everywhere at once. The TTL bounds staleness when
+# the cache is per process, as LocMemCache is.
+EMP_DET_CREDENTIAL_CACHE_SIZE = 1024
+EMP_DET_CREDENTIAL_CACHE_TTL = 60
+EMP_DET_CREDENTIAL_STAMP_CACHE = 'default'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'emp_det',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+# List responses are cached per data version (see emp_det/caching.py).
+EMP_DET_RESPONSE_CACHE_ENABLED = True
+EMP_DET_RESPONSE_CACHE_ALIAS = 'default'
+EMP_DET_RESPONSE_CACHE_TIMEOUT = 300
+
+# Build GET list responses straight from values() rows (emp_det/fastpath.py).
+EMP_DET_FAST_READ_PATH = True
+
+# Allowed growth before `manage.py benchmark --baseline` reports a regression:
+# relative for wall time and peak memory, absolute for queries per request.
+EMP_DET_BENCHMARK_THRESHOLDS = {'wall_ms': 0.25, 'peak_kb': 0.25, 'queries': 0}
+
+# Share of requests that get a Server-Timing header and a timing log line
+# (0 removes InstrumentationMiddleware), and how many of their slowest SQL
+# statements are logged.
+EMP_DET_INSTRUMENTATION_SAMPLE_RATE = 0.1
+EMP_DET_INSTRUMENTATION_SLOW_QUERIES = 3
+
+# Request, query, cache and report metrics served at /metrics. With several
+# worker processes, point EMP_DET_METRICS_DIR at a directory shared by them
+# (emptied on restart); each process flushes its samples there at most every
+# EMP_DET_METRICS_FLUSH_INTERVAL seconds.
+EMP_DET_METRICS_ENABLED = True
+EMP_DET_METRICS_DIR = None
+EMP_DET_METRICS_FLUSH_INTERVAL = 1.0
+
+# Serve GET on the employee/project list and detail endpoints and the report
+# download with async handlers (async ORM, no thread per request). Only worth
+# it under an ASGI server such as uvicorn or daphne; under WSGI every request
+# would pay for an event loop. Writes always go to the sync views.
+EMP_DET_ASYNC_VIEWS = False
+
+# Send X-Total-Count on paginated list responses (one extra COUNT per page).
+EMP_DET_PAGINATION_COUNT = True
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Django DRF Employee',
     'DESCRIPTION': 'API documentation for Django DRF Employee',